@@ -20,8 +20,9 @@ from app.core.config import ProjectConfig, DatabaseConfig
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
+# This line sets up loggers basically. Skipped when run in-process by the
+# app (database.run_migrations) so the application's logging is kept.
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -33,7 +34,7 @@ def get_url():
     """Get database URL from environment or project config"""
     import os
     
-    # Allow override via environment variable (used by database.py run_migrations)
+    # Allow override via environment variable
     env_url = os.getenv("ALEMBIC_DB_URL")
     if env_url:
         return env_url
@@ -91,6 +92,13 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Connection passed in-process by database.py run_migrations; it comes
+    # from the project's engine, so its search_path/PRAGMAs already apply
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+    
     configuration = config.get_section(config.config_ini_section, {})
     configuration["sqlalchemy.url"] = get_url()
     
@@ -101,12 +109,17 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        do_run_migrations(connection)
+
+
+def do_run_migrations(connection) -> None:
+    """Run migrations on an open connection"""
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
 
-        with context.begin_transaction():
-            context.run_migrations()
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
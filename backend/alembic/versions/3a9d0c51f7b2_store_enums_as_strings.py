@@ -0,0 +1,61 @@
+"""store_enums_as_strings
+
+Revision ID: 3a9d0c51f7b2
+Revises: e64b90a5efd8
+Create Date: 2026-10-16 11:48:12.306917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9d0c51f7b2'
+down_revision: Union[str, None] = 'e64b90a5efd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, PostgreSQL enum type, members)
+ENUM_COLUMNS = [
+    ('projects', 'current_phase', 'phasetype', ('PLANNER', 'ARCHITECT', 'REVIEW_APPROVAL', 'CODER')),
+    ('tasks', 'current_phase', 'phasetype', ('PLANNER', 'ARCHITECT', 'REVIEW_APPROVAL', 'CODER')),
+    ('change_requests', 'phase', 'phasetype', ('PLANNER', 'ARCHITECT', 'REVIEW_APPROVAL', 'CODER')),
+    ('tasks', 'status', 'taskstatus', ('PENDING', 'IN_PROGRESS', 'AWAITING_APPROVAL', 'APPROVED', 'REJECTED', 'COMPLETED', 'CANCELLED')),
+    ('change_requests', 'status', 'changerequeststatus', ('DRAFT', 'SUBMITTED', 'APPROVED', 'REJECTED', 'IMPLEMENTED')),
+    ('runs', 'status', 'runstatus', ('RUNNING', 'SUCCESS', 'FAILURE', 'TIMEOUT', 'CANCELLED')),
+    ('artifacts', 'artifact_type', 'artifacttype', ('SPEC', 'PLAN', 'ARCHITECTURE', 'ADR', 'TRANSCRIPT', 'DIFF', 'LOG', 'OTHER')),
+]
+
+
+def upgrade() -> None:
+    # SQLite already stores these as VARCHAR without a CHECK constraint;
+    # only PostgreSQL has native enum types to replace
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, _, _ in ENUM_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(32),
+            postgresql_using=f'{column}::text',
+        )
+    for type_name in {type_name for _, _, type_name, _ in ENUM_COLUMNS}:
+        op.execute(f'DROP TYPE IF EXISTS {type_name}')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    created = set()
+    for table, column, type_name, members in ENUM_COLUMNS:
+        enum_type = sa.Enum(*members, name=type_name)
+        if type_name not in created:
+            enum_type.create(op.get_bind())
+            created.add(type_name)
+        op.alter_column(
+            table, column,
+            type_=enum_type,
+            postgresql_using=f'{column}::{type_name}',
+        )
@@ -0,0 +1,83 @@
+"""store_json_payload_columns
+
+Revision ID: 5c8e21b4d093
+Revises: 3a9d0c51f7b2
+Create Date: 2026-10-16 12:31:54.771208
+
+"""
+import ast
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e21b4d093'
+down_revision: Union[str, None] = '3a9d0c51f7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = [
+    ('tasks', 'extra_data'),
+    ('artifacts', 'extra_data'),
+    ('task_versions', 'gates_json'),
+    ('task_versions', 'deps_json'),
+    ('task_versions', 'extra_data'),
+    ('runs', 'gate_results'),
+    ('runs', 'extra_data'),
+    ('control_state', 'extra_data'),
+]
+
+
+def _as_json(value: str) -> str:
+    """Re-encode a stored payload as valid JSON text"""
+    try:
+        json.loads(value)
+        return value
+    except ValueError:
+        pass
+    try:
+        # Artifacts stored str(dict) before this revision
+        return json.dumps(ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+        return json.dumps(value)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, column in JSON_COLUMNS:
+        rows = bind.execute(
+            sa.text(f'SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL')
+        ).all()
+        for row_id, value in rows:
+            fixed = _as_json(value)
+            if fixed != value:
+                bind.execute(
+                    sa.text(f'UPDATE {table} SET {column} = :value WHERE id = :id'),
+                    {'value': fixed, 'id': row_id},
+                )
+    
+    # SQLite keeps JSON as text, so only PostgreSQL changes column type
+    if bind.dialect.name != 'postgresql':
+        return
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.Text(),
+            postgresql_using=f'{column}::text',
+        )
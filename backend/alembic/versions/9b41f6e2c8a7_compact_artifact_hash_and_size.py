@@ -0,0 +1,65 @@
+"""compact_artifact_hash_and_size
+
+Revision ID: 9b41f6e2c8a7
+Revises: 5c8e21b4d093
+Create Date: 2026-10-16 13:05:18.440196
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b41f6e2c8a7'
+down_revision: Union[str, None] = '5c8e21b4d093'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Values that aren't a full hex SHA-256 become NULL on both backends
+_HEX_DIGEST = re.compile(r'[0-9a-fA-F]{64}')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column('artifacts', 'file_size', type_=sa.BigInteger())
+        op.alter_column(
+            'artifacts', 'sha256',
+            type_=sa.LargeBinary(32),
+            postgresql_using="CASE WHEN sha256 ~* '^[0-9a-f]{64}$' THEN decode(sha256, 'hex') END",
+        )
+        return
+    
+    # SQLite integers are already 64-bit; only the hex digests become blobs
+    rows = bind.execute(sa.text('SELECT id, sha256 FROM artifacts WHERE sha256 IS NOT NULL')).all()
+    for row_id, digest in rows:
+        if isinstance(digest, str) and _HEX_DIGEST.fullmatch(digest):
+            value = bytes.fromhex(digest)
+        else:
+            value = None  # Not a hex digest; nothing to verify against
+        bind.execute(
+            sa.text('UPDATE artifacts SET sha256 = :value WHERE id = :id'),
+            {'value': value, 'id': row_id},
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.alter_column(
+            'artifacts', 'sha256',
+            type_=sa.String(64),
+            postgresql_using="encode(sha256, 'hex')",
+        )
+        op.alter_column('artifacts', 'file_size', type_=sa.Integer())
+        return
+    
+    rows = bind.execute(sa.text('SELECT id, sha256 FROM artifacts WHERE sha256 IS NOT NULL')).all()
+    for row_id, digest in rows:
+        bind.execute(
+            sa.text('UPDATE artifacts SET sha256 = :value WHERE id = :id'),
+            {'value': bytes(digest).hex(), 'id': row_id},
+        )
@@ -0,0 +1,27 @@
+"""add_artifact_blake3_digest
+
+Revision ID: d27f4a8e61c3
+Revises: 9b41f6e2c8a7
+Create Date: 2026-10-16 14:02:37.615204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd27f4a8e61c3'
+down_revision: Union[str, None] = '9b41f6e2c8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('artifacts', sa.Column('blake3', sa.LargeBinary(32), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('artifacts') as batch_op:
+        batch_op.drop_column('blake3')
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pathlib import Path
 
 from app.db import get_db, get_db_session
@@ -26,8 +26,9 @@ class ArtifactCreate(BaseModel):
     file_path: str
     task_id: Optional[int] = None
     run_id: Optional[int] = None
-    sha256: Optional[str] = None
-    extra_data: Optional[str] = None
+    sha256: Optional[str] = Field(default=None, pattern=r"^([0-9a-fA-F]{2})*$")  # Hex digest
+    blake3: Optional[str] = Field(default=None, pattern=r"^([0-9a-fA-F]{2})*$")
+    extra_data: Optional[dict] = None
 
 
 class ArtifactResponse(BaseModel):
@@ -40,7 +41,8 @@ class ArtifactResponse(BaseModel):
     name: str
     file_path: str
     sha256: Optional[str]
-    extra_data: Optional[str]
+    blake3: Optional[str] = None
+    extra_data: Optional[dict]
     
     class Config:
         from_attributes = True
@@ -81,6 +83,7 @@ async def create_artifact(artifact: ArtifactCreate, db: Session = Depends(get_db
         task_id=artifact.task_id,
         run_id=artifact.run_id,
         sha256=artifact.sha256,
+        blake3=artifact.blake3,
         extra_data=artifact.extra_data
     )
     
@@ -116,7 +119,7 @@ async def upload_artifact(
             raise HTTPException(status_code=400, detail="Filename is required")
         
         # Store artifact using storage service
-        artifact_dict = artifact_storage.store_artifact(
+        artifact_dict = await artifact_storage.store_artifact_async(
             session=db,
             project_id=project_id,
             task_id=task_id,
@@ -162,10 +165,12 @@ async def download_artifact(artifact_id: int, db: Session = Depends(get_db_sessi
     try:
         artifact_dict, file_path = artifact_storage.retrieve_artifact(db, artifact_id)
         
-        # Verify file integrity
-        if artifact_dict.get("sha256"):
-            if not artifact_storage.verify_artifact(file_path, artifact_dict["sha256"]):
-                raise HTTPException(status_code=500, detail="Artifact file integrity check failed")
+        # Verify against the fastest recorded digest this install can compute
+        for algo in (*artifact_storage.EXTRA_DIGESTS, "sha256"):
+            if artifact_dict.get(algo):
+                if not await artifact_storage.verify_artifact_async(file_path, artifact_dict[algo], algo):
+                    raise HTTPException(status_code=500, detail="Artifact file integrity check failed")
+                break
         
         return FileResponse(
             path=file_path,
@@ -220,7 +225,7 @@ async def delete_artifact(artifact_id: int, db: Session = Depends(get_db_session
         if storage_path.exists():
             # Use storage service for cleanup
             filename = storage_path.name
-            artifact_storage.delete_artifact_file(project_id, artifact_id, filename)
+            artifact_storage.delete_artifact_file(project_id, artifact_id, filename, artifact.sha256)
     
     # Delete database record
     success = dao.delete_artifact(db, artifact_id)
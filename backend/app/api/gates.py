@@ -5,7 +5,6 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-import json
 
 from app.db import get_db, get_db_session
 from app.db import dao
@@ -48,11 +47,7 @@ async def get_task_gates(task_id: int, db: Session = Depends(get_db_session)):
     if not latest_version or not latest_version.gates_json:
         return []
     
-    try:
-        gates_data = json.loads(latest_version.gates_json)
-        return gates_data
-    except json.JSONDecodeError:
-        return []
+    return latest_version.gates_json
 
 
 @router.put("/task/{task_id}")
@@ -70,8 +65,7 @@ async def update_task_gates(
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     
-    # Convert gates to JSON
-    gates_json = json.dumps([g.dict() for g in gates])
+    gates_json = [g.dict() for g in gates]
     
     # Create new task version with gates
     new_version_num = task.version + 1
@@ -133,9 +127,8 @@ async def execute_gates(
         }
     
     try:
-        gates_data = json.loads(latest_version.gates_json)
-        gate_specs = [GateSpec(**g) for g in gates_data]
-    except (json.JSONDecodeError, ValueError) as e:
+        gate_specs = [GateSpec(**g) for g in latest_version.gates_json]
+    except (TypeError, ValueError) as e:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid gates configuration: {str(e)}"
@@ -180,7 +173,7 @@ async def execute_gates(
         summary = gate_runner.get_summary(results)
         
         # Convert results to dict for JSON serialization
-        results_dict = [r.dict() for r in results]
+        results_dict = [r.to_dict() for r in results]
         
         return {
             "success": True,
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from app.db import get_db, get_db_session
 from app.db import dao
 from app.models import TaskStatus, PhaseType
+from app.models.models import NEXT_PHASE
 from app.core.events import EventType, emit_task_event
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
@@ -56,9 +57,9 @@ class TaskVersionResponse(BaseModel):
     version_num: int
     title: str
     description: Optional[str]
-    gates_json: Optional[str]
-    deps_json: Optional[str]
-    extra_data: Optional[str]
+    gates_json: Optional[list]
+    deps_json: Optional[list]
+    extra_data: Optional[dict]
     created_at: datetime
     
     class Config:
@@ -90,8 +91,8 @@ async def list_tasks(
     db: Session = Depends(get_db_session)
 ):
     """List all tasks, optionally filtered by project, status, or phase"""
-    tasks = dao.list_tasks(db, project_id=project_id, status=status, phase=phase, skip=skip, limit=limit)
-    return tasks
+    # Read-only listing: plain rows avoid building ORM instances
+    return dao.list_tasks_raw(db, project_id=project_id, status=status, phase=phase, skip=skip, limit=limit)
 
 
 @router.post("/", response_model=TaskResponse)
@@ -143,33 +144,37 @@ async def update_task(
     # Check if this is a significant edit (title or description change)
     significant_edit = any(key in update_data for key in ['title', 'description'])
     
-    if significant_edit:
-        # Create a new TaskVersion with current state before updating
-        new_version_num = task.version + 1
-        
-        # Create version record
-        task_version = dao.create_task_version(
-            db=db,
-            task_id=task_id,
-            version_num=new_version_num,
-            title=update_data.get('title', task.title),
-            description=update_data.get('description', task.description),
-            gates_json=None,  # TODO: Add gates support
-            deps_json=None,   # TODO: Add deps support
-            extra_data=None
-        )
-        
-        # Update task version number and active_version_id
-        update_data['version'] = new_version_num
-        update_data['active_version_id'] = task_version.id
+    old_status = task.status
     
-    # Apply updates
-    updated_task = dao.update_task(db, task_id, **update_data)
+    # Version record and task update commit together
+    with dao.transaction(db):
+        if significant_edit:
+            # Create a new TaskVersion with current state before updating
+            new_version_num = task.version + 1
+            
+            # Create version record
+            task_version = dao.create_task_version(
+                db=db,
+                task_id=task_id,
+                version_num=new_version_num,
+                title=update_data.get('title', task.title),
+                description=update_data.get('description', task.description),
+                gates_json=None,  # TODO: Add gates support
+                deps_json=None,   # TODO: Add deps support
+                extra_data=None
+            )
+            
+            # Update task version number and active_version_id
+            update_data['version'] = new_version_num
+            update_data['active_version_id'] = task_version.id
+        
+        # Apply updates
+        updated_task = dao.update_task(db, task_id, **update_data)
     
     # Emit appropriate event
     if "status" in update_data:
         emit_task_event(EventType.TASK_STATUS_CHANGED, project_id, task_id, {
-            "old_status": task.status.value,
+            "old_status": old_status.value,
             "new_status": update_data["status"].value
         })
     else:
@@ -201,11 +206,12 @@ async def approve_task(task_id: int, project_id: int, approver: str = "system",
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     
-    # Create approval record
-    dao.create_approval(db, task_id=task_id, approver=approver, approved=True)
-    
-    # Update task status to APPROVED
-    dao.update_task(db, task_id, status=TaskStatus.APPROVED)
+    with dao.transaction(db):
+        # Create approval record
+        dao.create_approval(db, task_id=task_id, approver=approver, approved=True)
+        
+        # Update task status to APPROVED
+        dao.update_task(db, task_id, status=TaskStatus.APPROVED)
     
     emit_task_event(EventType.TASK_STATUS_CHANGED, project_id, task_id, {
         "status": "approved",
@@ -223,11 +229,8 @@ async def advance_task(task_id: int, project_id: int, db: Session = Depends(get_
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     
     # Determine next phase
-    phase_order = [PhaseType.PLANNER, PhaseType.ARCHITECT, PhaseType.REVIEW_APPROVAL, PhaseType.CODER]
-    current_idx = phase_order.index(task.current_phase) if task.current_phase else -1
-    
-    if current_idx < len(phase_order) - 1:
-        next_phase = phase_order[current_idx + 1]
+    next_phase = NEXT_PHASE[task.current_phase]
+    if next_phase is not None:
         dao.update_task(db, task_id, current_phase=next_phase)
         
         emit_task_event(EventType.TASK_UPDATED, project_id, task_id, {
@@ -251,8 +254,7 @@ async def advance_task(task_id: int, project_id: int, db: Session = Depends(get_
 @router.get("/{task_id}/versions", response_model=List[TaskVersionResponse])
 async def get_task_versions(task_id: int, db: Session = Depends(get_db_session)):
     """Get all versions of a task"""
-    task = dao.get_task(db, task_id)
-    if not task:
+    if not dao.task_exists(db, task_id):
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     
     versions = dao.list_task_versions(db, task_id)
@@ -272,33 +274,34 @@ async def split_task(
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     
-    # Create two new tasks
-    task1 = dao.create_task(
-        db=db,
-        project_id=project_id,
-        title=split_request.task1_title,
-        description=split_request.task1_description,
-        priority=task.priority
-    )
-    
-    task2 = dao.create_task(
-        db=db,
-        project_id=project_id,
-        title=split_request.task2_title,
-        description=split_request.task2_description,
-        priority=task.priority
-    )
-    
-    # Mark original task as superseded
-    import json
-    extra_data = json.loads(task.extra_data) if task.extra_data else {}
-    extra_data['superseded_by'] = [task1.id, task2.id]
-    extra_data['split_reason'] = 'Task split into multiple tasks'
-    
-    dao.update_task(db, task_id, 
-        status=TaskStatus.CANCELLED,
-        extra_data=json.dumps(extra_data)
-    )
+    # New tasks and the superseded original commit together
+    with dao.transaction(db):
+        # Create two new tasks
+        task1 = dao.create_task(
+            db=db,
+            project_id=project_id,
+            title=split_request.task1_title,
+            description=split_request.task1_description,
+            priority=task.priority
+        )
+        
+        task2 = dao.create_task(
+            db=db,
+            project_id=project_id,
+            title=split_request.task2_title,
+            description=split_request.task2_description,
+            priority=task.priority
+        )
+        
+        # Mark original task as superseded
+        extra_data = dict(task.extra_data or {})
+        extra_data['superseded_by'] = [task1.id, task2.id]
+        extra_data['split_reason'] = 'Task split into multiple tasks'
+        
+        dao.update_task(db, task_id, 
+            status=TaskStatus.CANCELLED,
+            extra_data=extra_data
+        )
     
     emit_task_event(EventType.TASK_UPDATED, project_id, task_id, {
         "action": "split",
@@ -322,8 +325,6 @@ async def merge_tasks(
     db: Session = Depends(get_db_session)
 ):
     """Merge multiple tasks into a single task"""
-    import json
-    
     if len(merge_request.task_ids) < 2:
         raise HTTPException(status_code=400, detail="Must provide at least 2 tasks to merge")
     
@@ -346,14 +347,14 @@ async def merge_tasks(
     
     # Mark source tasks as superseded
     for task in tasks:
-        extra_data = json.loads(task.extra_data) if task.extra_data else {}
+        extra_data = dict(task.extra_data or {})
         extra_data['superseded_by'] = merged_task.id
         extra_data['merge_reason'] = 'Task merged with others'
         extra_data['merged_with'] = [t.id for t in tasks if t.id != task.id]
         
         dao.update_task(db, task.id,
             status=TaskStatus.CANCELLED,
-            extra_data=json.dumps(extra_data)
+            extra_data=extra_data
         )
     
     emit_task_event(EventType.TASK_UPDATED, project_id, merged_task.id, {
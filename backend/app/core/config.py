@@ -49,6 +49,10 @@ class DatabaseConfig(BaseModel):
         default="./data",
         description="Path for SQLite database files (SQLite only)"
     )
+    sqlite_pooling: bool = Field(
+        default=True,
+        description="Reuse pooled connections to project databases (SQLite only)"
+    )
     # PostgreSQL-specific
     host: Optional[str] = Field(
         default=None,
@@ -70,18 +74,22 @@ class DatabaseConfig(BaseModel):
         default=None,
         description="Database password (PostgreSQL only)"
     )
-    # Connection pool settings (PostgreSQL)
+    # Connection pool settings
     pool_size: int = Field(
         default=5,
-        description="Connection pool size (PostgreSQL only)"
+        description="Connection pool size"
     )
     max_overflow: int = Field(
         default=10,
-        description="Max overflow connections (PostgreSQL only)"
+        description="Max overflow connections"
     )
     pool_timeout: int = Field(
         default=30,
-        description="Pool timeout in seconds (PostgreSQL only)"
+        description="Pool timeout in seconds"
+    )
+    pool_recycle: int = Field(
+        default=1800,
+        description="Recycle pooled connections older than this many seconds (PostgreSQL only)"
     )
 
 
@@ -4,6 +4,7 @@ Gates are executable checks that must pass before a task can proceed.
 """
 from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 import re
@@ -11,6 +12,10 @@ import re
 from .sandbox import CommandRunner, SafePathResolver, SecurityError
 
 
+# Any of these means expected_output must be treated as a real regex
+_REGEX_META = re.compile(r'[\\^$.|?*+()\[\]{}]')
+
+
 class GateSpec(BaseModel):
     """
     Specification for a validation gate.
@@ -44,16 +49,25 @@ class GateSpec(BaseModel):
     )
 
 
-class GateResult(BaseModel):
-    """Result of gate execution."""
+@dataclass(slots=True, frozen=True)
+class GateResult:
+    """
+    Result of gate execution.
+    Plain slotted dataclass: results are only ever built by GateRunner,
+    so they skip pydantic validation and per-instance __dict__ overhead.
+    """
     gate_name: str
     passed: bool
     exit_code: int
     stdout: str
     stderr: str
-    error: Optional[str] = None
     execution_time: float
-    executed_at: datetime = Field(default_factory=datetime.now)
+    error: Optional[str] = None
+    executed_at: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to a dictionary for JSON serialization."""
+        return asdict(self)
 
 
 class GateRunner:
@@ -196,6 +210,9 @@ class GateRunner:
             if not gate.expected_output:
                 return exit_code == 0
             combined_output = stdout + stderr
+            # Literal patterns are plain substring checks; skip the regex engine
+            if _REGEX_META.search(gate.expected_output) is None:
+                return gate.expected_output in combined_output
             try:
                 pattern = re.compile(gate.expected_output)
                 return bool(pattern.search(combined_output))
@@ -245,6 +262,8 @@ class GateRunner:
     def all_passed(self, results: List[GateResult]) -> bool:
         """
         Check if all gates passed.
+        Callers that also need statistics should read "all_passed"
+        from get_summary() instead of iterating the results twice.
         
         Args:
             results: List of gate results
@@ -265,9 +284,15 @@ class GateRunner:
             Dictionary with summary statistics
         """
         total = len(results)
-        passed = sum(1 for r in results if r.passed)
+        passed = 0
+        total_time = 0.0
+        
+        # Single pass over results for both aggregates
+        for r in results:
+            passed += r.passed
+            total_time += r.execution_time
+        
         failed = total - passed
-        total_time = sum(r.execution_time for r in results)
         
         return {
             "total": total,
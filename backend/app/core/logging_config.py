@@ -147,6 +147,23 @@ class RunLogger:
         self.logger.setLevel(logging.DEBUG)
         self.logger.addHandler(self.file_handler)
         self.logger.propagate = False  # Don't propagate to root logger
+        
+        # Run context attached to every record; logging copies extra into
+        # the record, so this dict can be shared when no kwargs are given
+        self._base_extra = {"run_id": run_id}
+        if project_id:
+            self._base_extra["project_id"] = project_id
+        if task_id:
+            self._base_extra["task_id"] = task_id
+        
+        # Bound logger methods by level name, resolved once instead of per call
+        self._dispatch = {
+            "debug": self.logger.debug,
+            "info": self.logger.info,
+            "warning": self.logger.warning,
+            "error": self.logger.error,
+            "critical": self.logger.critical
+        }
     
     def log(self, level: str, message: str, **kwargs) -> None:
         """
@@ -157,39 +174,39 @@ class RunLogger:
             message: Log message
             **kwargs: Additional context to include in log
         """
-        log_func = getattr(self.logger, level.lower())
-        
-        # Create extra dict for custom fields
-        extra = {
-            "run_id": self.run_id
-        }
-        if self.project_id:
-            extra["project_id"] = self.project_id
-        if self.task_id:
-            extra["task_id"] = self.task_id
-        extra.update(kwargs)
+        log_func = self._dispatch.get(level)
+        if log_func is None:
+            log_func = self._dispatch[level.lower()]
+        self._emit(log_func, message, kwargs)
+    
+    def _emit(self, log_func, message: str, kwargs: dict) -> None:
+        """Emit a record through a bound logger method with run context attached"""
+        if kwargs:
+            extra = {**self._base_extra, **kwargs}
+        else:
+            extra = self._base_extra
         
         log_func(message, extra=extra)
     
     def debug(self, message: str, **kwargs) -> None:
         """Log debug message"""
-        self.log("debug", message, **kwargs)
+        self._emit(self._dispatch["debug"], message, kwargs)
     
     def info(self, message: str, **kwargs) -> None:
         """Log info message"""
-        self.log("info", message, **kwargs)
+        self._emit(self._dispatch["info"], message, kwargs)
     
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message"""
-        self.log("warning", message, **kwargs)
+        self._emit(self._dispatch["warning"], message, kwargs)
     
     def error(self, message: str, **kwargs) -> None:
         """Log error message"""
-        self.log("error", message, **kwargs)
+        self._emit(self._dispatch["error"], message, kwargs)
     
     def critical(self, message: str, **kwargs) -> None:
         """Log critical message"""
-        self.log("critical", message, **kwargs)
+        self._emit(self._dispatch["critical"], message, kwargs)
     
     def close(self) -> None:
         """Close the run logger"""
@@ -4,11 +4,36 @@ Prevents directory traversal, enforces allowlists, and provides timeout controls
 """
 import os
 import re
+import shlex
 from pathlib import Path
 from typing import List, Optional, Set
 import fnmatch
 
 
+# Default allowlist: everything within the root
+_DEFAULT_PATTERNS: tuple[str, ...] = ("**/*",)
+
+# Characters that require a real shell (pipes, redirects, expansion, globbing, ...)
+_SHELL_METACHARS = frozenset(";|&<>`$()*?~[]{}#\n")
+
+# POSIX special and regular built-ins (plus source): these have no executable
+# to exec, or behave differently outside the shell, so they always use /bin/sh
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "break", "continue", "eval", "exec", "exit", "export", "readonly",
+    "return", "set", "shift", "times", "trap", "unset",
+    "alias", "bg", "cd", "command", "false", "fc", "fg", "getopts", "hash", "jobs",
+    "kill", "newgrp", "pwd", "read", "true", "type", "ulimit", "umask", "unalias",
+    "wait", "source",
+})
+
+# Reserved words (plus the bash/ksh keywords time, [[ and function) start
+# compound commands or pipelines; exec'ing them would look up a binary
+_SHELL_RESERVED_WORDS = frozenset({
+    "!", "{", "}", "case", "do", "done", "elif", "else", "esac", "fi", "for",
+    "if", "in", "then", "until", "while", "time", "[[", "]]", "function", "select",
+})
+
+
 class SafePathResolver:
     """
     Validates file paths against allowlist patterns and prevents directory traversal.
@@ -24,7 +49,7 @@ class SafePathResolver:
             allowed_patterns: List of glob patterns for allowed paths (e.g., ["src/**", "tests/**"])
         """
         self.root_path = Path(root_path).resolve()
-        self.allowed_patterns = allowed_patterns or ["**/*"]  # Default: allow all within root
+        self.allowed_patterns = tuple(allowed_patterns) if allowed_patterns else _DEFAULT_PATTERNS
         
     def resolve(self, path: str) -> Path:
         """
@@ -235,14 +260,32 @@ class CommandRunner:
         # Use default timeout if not specified
         exec_timeout = timeout if timeout is not None else self.default_timeout
         
-        # Create subprocess
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=cwd,
-            env=env
-        )
+        # Simple commands are exec'd directly; only shell syntax pays for /bin/sh
+        argv = self._split_simple_command(command)
+        proc = None
+        if argv is not None:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=cwd,
+                    env=env
+                )
+            except FileNotFoundError:
+                # Mirror the shell's "command not found" result
+                return 127, "", f"{argv[0]}: command not found\n"
+            except OSError:
+                # Not executable, no shebang, ...: let the shell apply its own rules
+                proc = None
+        if proc is None:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env
+            )
         
         try:
             # Wait with timeout
@@ -252,7 +295,12 @@ class CommandRunner:
             )
             
             returncode = proc.returncode if proc.returncode is not None else -1
-            return returncode, stdout.decode(), stderr.decode()
+            # Tool output is not guaranteed to be valid UTF-8; never fail the gate on decoding
+            return (
+                returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace")
+            )
             
         except asyncio.TimeoutError:
             # Kill process on timeout
@@ -262,6 +310,36 @@ class CommandRunner:
                 f"Command exceeded timeout of {exec_timeout} seconds: {command}"
             )
     
+    @staticmethod
+    def _split_simple_command(command: str) -> Optional[List[str]]:
+        """
+        Tokenize a command that needs no shell features.
+        
+        Args:
+            command: Command string to tokenize
+            
+        Returns:
+            Argument list, or None if the command must run through a shell
+        """
+        if any(ch in _SHELL_METACHARS for ch in command):
+            return None
+        
+        try:
+            argv = shlex.split(command)
+        except ValueError:
+            return None
+        
+        # Leading VAR=value assignments, built-ins and reserved words are shell features
+        if (
+            not argv
+            or '=' in argv[0]
+            or argv[0] in _SHELL_BUILTINS
+            or argv[0] in _SHELL_RESERVED_WORDS
+        ):
+            return None
+        
+        return argv
+    
     def is_allowed(self, command: str) -> bool:
         """
         Check if a command is allowed without raising an exception.
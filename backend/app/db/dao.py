@@ -3,18 +3,191 @@ Data Access Object (DAO) layer for database operations.
 Provides CRUD operations for all entities.
 """
 
-from typing import List, Optional, Dict, Any
+from contextlib import contextmanager
+from itertools import product
+from contextvars import ContextVar
+from typing import List, Optional, Dict, Any, Iterator, Sequence
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import bindparam, desc, func, insert, select, update, delete, exists, lambda_stmt, inspect as sa_inspect
 
 from app.models.models import (
     Project, Task, ChangeRequest, Approval, Artifact,
     TaskVersion, Run, ControlState,
-    TaskStatus, PhaseType, ChangeRequestStatus, ArtifactType, RunStatus
+    TaskStatus, PhaseType, ChangeRequestStatus, ArtifactType, RunStatus,
+    FINAL_RUN_STATUSES
 )
 
 
+# Per-request lookup cache, keyed by (session id, model, key); None outside a request
+_dao_cache: ContextVar[Optional[Dict[tuple, Any]]] = ContextVar("dao_cache", default=None)
+
+
+@contextmanager
+def request_cache():
+    """Enable the get_project/get_task/get_control_state cache for the enclosed scope"""
+    token = _dao_cache.set({})
+    try:
+        yield
+    finally:
+        _dao_cache.reset(token)
+
+
+def _cached_get(db: Session, model, key, loader):
+    """Return a cached row for (model, key) or load and cache it"""
+    cache = _dao_cache.get()
+    if cache is None:
+        return loader()
+    cache_key = (id(db), model, key)
+    if cache_key in cache:
+        return cache[cache_key]
+    obj = loader()
+    if obj is not None:
+        cache[cache_key] = obj
+    return obj
+
+
+def _invalidate(db: Session, model, key) -> None:
+    """Drop a cached row after it is updated or deleted"""
+    cache = _dao_cache.get()
+    if cache is not None:
+        cache.pop((id(db), model, key), None)
+
+
+def _eager_options(model, eager: Optional[Sequence[str]]) -> list:
+    """
+    Build loader options for the named relationships.
+
+    Many-to-one relationships are joined; collections use selectinload so
+    each collection costs one extra IN query instead of a row explosion.
+    """
+    options = []
+    for name in eager or ():
+        attr = getattr(model, name)
+        if attr.property.uselist:
+            options.append(selectinload(attr))
+        else:
+            options.append(joinedload(attr))
+    return options
+
+
+# Session.info flag set while a transaction() block defers DAO commits
+_DEFER_COMMIT = "dao_defer_commit"
+
+
+def _commit(db: Session) -> None:
+    """Commit, or just flush when inside a transaction() block"""
+    if db.info.get(_DEFER_COMMIT):
+        db.flush()
+    else:
+        db.commit()
+
+
+@contextmanager
+def transaction(db: Session):
+    """
+    Group several DAO writes into a single commit.
+
+    DAO calls made inside the block flush instead of committing; the block
+    commits once on success and rolls back on error. Nested blocks join the
+    outer one.
+    """
+    if db.info.get(_DEFER_COMMIT):
+        yield db
+        return
+    
+    db.info[_DEFER_COMMIT] = True
+    try:
+        yield db
+        db.info.pop(_DEFER_COMMIT, None)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(_DEFER_COMMIT, None)
+
+
+def _build_list_statements(entities, filters, order_by) -> Dict[tuple, Any]:
+    """
+    Prebuild one SELECT per combination of optional equality filters.
+
+    Args:
+        entities: Mapped classes or columns to select
+        filters: (param name, column) pairs, in the order of the lookup key
+        order_by: ORDER BY clauses
+
+    Returns:
+        Dict keyed by a tuple of booleans marking which filters are set
+    """
+    statements = {}
+    for enabled in product((False, True), repeat=len(filters)):
+        stmt = select(*entities)
+        for is_set, (name, column) in zip(enabled, filters):
+            if is_set:
+                stmt = stmt.where(column == bindparam(name))
+        statements[enabled] = (
+            stmt.order_by(*order_by).offset(bindparam("skip")).limit(bindparam("limit"))
+        )
+    return statements
+
+
+# Rows per executemany batch for bulk_create_* helpers
+BULK_CHUNK_SIZE = 10_000
+
+# Rows fetched per round trip by iter_* helpers
+STREAM_BATCH_SIZE = 1000
+
+
+def _bulk_insert(db: Session, model, rows: List[Dict[str, Any]]) -> int:
+    """Insert rows in chunked executemany batches and commit once"""
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        db.execute(insert(model), rows[start:start + BULK_CHUNK_SIZE])
+    _commit(db)
+    return len(rows)
+
+
+def _update_columns(db: Session, model, key_column, key, kwargs: Dict[str, Any]):
+    """
+    Update a row with a single UPDATE ... RETURNING statement.
+
+    Unknown keys are ignored, as with setattr-based updates. Falls back to
+    load-mutate-commit for non-column attributes or dialects without
+    UPDATE ... RETURNING support.
+
+    Returns:
+        The updated instance, or None if no row matched
+    """
+    columns = sa_inspect(model).column_attrs.keys()
+    values = {k: v for k, v in kwargs.items() if k in columns}
+    has_other_attrs = any(k not in columns and hasattr(model, k) for k in kwargs)
+
+    if has_other_attrs or not values or not db.get_bind().dialect.update_returning:
+        obj = db.query(model).filter(key_column == key).first()
+        if not obj:
+            return None
+        for k, v in kwargs.items():
+            if hasattr(obj, k):
+                setattr(obj, k, v)
+        _commit(db)
+        db.refresh(obj)
+        return obj
+
+    stmt = (
+        update(model)
+        .where(key_column == key)
+        .values(**values)
+        .returning(model)
+        # Sessions don't expire on commit, so overwrite any loaded instance
+        .execution_options(populate_existing=True)
+    )
+    obj = db.execute(stmt).scalar_one_or_none()
+    _commit(db)
+    return obj
+
+
 # ==================== PROJECT DAO ====================
 
 def create_project(
@@ -33,14 +206,20 @@ def create_project(
         default_engine=default_engine
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    _commit(db)
     return project
 
 
 def get_project(db: Session, project_id: int) -> Optional[Project]:
     """Get project by ID"""
-    return db.query(Project).filter(Project.id == project_id).first()
+    stmt = lambda_stmt(lambda: select(Project).where(Project.id == project_id))
+    return _cached_get(db, Project, project_id, lambda: db.execute(stmt).scalars().first())
+
+
+def project_exists(db: Session, project_id: int) -> bool:
+    """Check whether a project exists without loading it"""
+    stmt = lambda_stmt(lambda: select(exists().where(Project.id == project_id)))
+    return bool(db.execute(stmt).scalar())
 
 
 def get_project_by_name(db: Session, name: str) -> Optional[Project]:
@@ -55,17 +234,8 @@ def list_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]
 
 def update_project(db: Session, project_id: int, **kwargs) -> Optional[Project]:
     """Update project fields"""
-    project = get_project(db, project_id)
-    if not project:
-        return None
-    
-    for key, value in kwargs.items():
-        if hasattr(project, key):
-            setattr(project, key, value)
-    
-    db.commit()
-    db.refresh(project)
-    return project
+    _invalidate(db, Project, project_id)
+    return _update_columns(db, Project, Project.id, project_id, kwargs)
 
 
 def delete_project(db: Session, project_id: int) -> bool:
@@ -75,7 +245,8 @@ def delete_project(db: Session, project_id: int) -> bool:
         return False
     
     db.delete(project)
-    db.commit()
+    _commit(db)
+    _invalidate(db, Project, project_id)
     return True
 
 
@@ -102,14 +273,37 @@ def create_task(
         attempts=0
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    _commit(db)
     return task
 
 
+def bulk_create_tasks(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Create many tasks in one transaction; returns number of rows inserted"""
+    return _bulk_insert(db, Task, rows)
+
+
 def get_task(db: Session, task_id: int) -> Optional[Task]:
     """Get task by ID"""
-    return db.query(Task).filter(Task.id == task_id).first()
+    stmt = lambda_stmt(lambda: select(Task).where(Task.id == task_id))
+    return _cached_get(db, Task, task_id, lambda: db.execute(stmt).scalars().first())
+
+
+def task_exists(db: Session, task_id: int) -> bool:
+    """Check whether a task exists without loading it"""
+    stmt = lambda_stmt(lambda: select(exists().where(Task.id == task_id)))
+    return bool(db.execute(stmt).scalar())
+
+
+_LIST_TASK_FILTERS = [("project_id", Task.project_id), ("status", Task.status), ("phase", Task.current_phase)]
+_LIST_TASK_ORDER = [desc(Task.priority), Task.created_at]
+_LIST_TASK_STATEMENTS = _build_list_statements([Task], _LIST_TASK_FILTERS, _LIST_TASK_ORDER)
+
+# Columns returned by list_tasks_raw (the task list API payload)
+TASK_LIST_COLUMNS = (
+    Task.id, Task.project_id, Task.title, Task.description, Task.status,
+    Task.current_phase, Task.version, Task.attempts, Task.priority,
+)
+_LIST_TASK_RAW_STATEMENTS = _build_list_statements(TASK_LIST_COLUMNS, _LIST_TASK_FILTERS, _LIST_TASK_ORDER)
 
 
 def list_tasks(
@@ -118,34 +312,53 @@ def list_tasks(
     status: Optional[TaskStatus] = None,
     phase: Optional[PhaseType] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    eager: Optional[Sequence[str]] = None
 ) -> List[Task]:
-    """List tasks with optional filters"""
-    query = db.query(Task)
+    """List tasks with optional filters; eager names relationships to preload"""
+    stmt = _LIST_TASK_STATEMENTS[(project_id is not None, status is not None, phase is not None)]
+    if eager:
+        stmt = stmt.options(*_eager_options(Task, eager))
     
+    params = {"project_id": project_id, "status": status, "phase": phase, "skip": skip, "limit": limit}
+    return list(db.execute(stmt, params).scalars())
+
+
+def list_tasks_raw(
+    db: Session,
+    project_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    phase: Optional[PhaseType] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """List tasks as plain dicts of TASK_LIST_COLUMNS, skipping ORM instance construction"""
+    stmt = _LIST_TASK_RAW_STATEMENTS[(project_id is not None, status is not None, phase is not None)]
+    params = {"project_id": project_id, "status": status, "phase": phase, "skip": skip, "limit": limit}
+    return [dict(row) for row in db.execute(stmt, params).mappings()]
+
+
+def iter_tasks(
+    db: Session,
+    project_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[Task]:
+    """Stream tasks in batches without materializing the whole result"""
+    stmt = select(Task)
     if project_id is not None:
-        query = query.filter(Task.project_id == project_id)
+        stmt = stmt.where(Task.project_id == project_id)
     if status is not None:
-        query = query.filter(Task.status == status)
-    if phase is not None:
-        query = query.filter(Task.current_phase == phase)
+        stmt = stmt.where(Task.status == status)
     
-    return query.order_by(desc(Task.priority), Task.created_at).offset(skip).limit(limit).all()
+    stmt = stmt.order_by(Task.id).execution_options(yield_per=batch_size)
+    yield from db.scalars(stmt)
 
 
 def update_task(db: Session, task_id: int, **kwargs) -> Optional[Task]:
     """Update task fields"""
-    task = get_task(db, task_id)
-    if not task:
-        return None
-    
-    for key, value in kwargs.items():
-        if hasattr(task, key):
-            setattr(task, key, value)
-    
-    db.commit()
-    db.refresh(task)
-    return task
+    _invalidate(db, Task, task_id)
+    return _update_columns(db, Task, Task.id, task_id, kwargs)
 
 
 def delete_task(db: Session, task_id: int) -> bool:
@@ -155,7 +368,8 @@ def delete_task(db: Session, task_id: int) -> bool:
         return False
     
     db.delete(task)
-    db.commit()
+    _commit(db)
+    _invalidate(db, Task, task_id)
     return True
 
 
@@ -175,9 +389,9 @@ def create_task_version(
     version_num: int,
     title: str,
     description: Optional[str] = None,
-    gates_json: Optional[str] = None,
-    deps_json: Optional[str] = None,
-    extra_data: Optional[str] = None
+    gates_json: Optional[list] = None,
+    deps_json: Optional[list] = None,
+    extra_data: Optional[dict] = None
 ) -> TaskVersion:
     """Create a new task version"""
     version = TaskVersion(
@@ -190,11 +404,15 @@ def create_task_version(
         extra_data=extra_data
     )
     db.add(version)
-    db.commit()
-    db.refresh(version)
+    _commit(db)
     return version
 
 
+def bulk_create_task_versions(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Create many task versions in one transaction; returns number of rows inserted"""
+    return _bulk_insert(db, TaskVersion, rows)
+
+
 def get_task_version(db: Session, version_id: int) -> Optional[TaskVersion]:
     """Get task version by ID"""
     return db.query(TaskVersion).filter(TaskVersion.id == version_id).first()
@@ -233,14 +451,21 @@ def create_change_request(
         version=version
     )
     db.add(cr)
-    db.commit()
-    db.refresh(cr)
+    _commit(db)
     return cr
 
 
 def get_change_request(db: Session, cr_id: int) -> Optional[ChangeRequest]:
     """Get change request by ID"""
-    return db.query(ChangeRequest).filter(ChangeRequest.id == cr_id).first()
+    stmt = lambda_stmt(lambda: select(ChangeRequest).where(ChangeRequest.id == cr_id))
+    return db.execute(stmt).scalars().first()
+
+
+_LIST_CHANGE_REQUEST_STATEMENTS = _build_list_statements(
+    [ChangeRequest],
+    [("task_id", ChangeRequest.task_id), ("status", ChangeRequest.status)],
+    [desc(ChangeRequest.created_at)],
+)
 
 
 def list_change_requests(
@@ -248,32 +473,21 @@ def list_change_requests(
     task_id: Optional[int] = None,
     status: Optional[ChangeRequestStatus] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    eager: Optional[Sequence[str]] = None
 ) -> List[ChangeRequest]:
-    """List change requests with optional filters"""
-    query = db.query(ChangeRequest)
-    
-    if task_id is not None:
-        query = query.filter(ChangeRequest.task_id == task_id)
-    if status is not None:
-        query = query.filter(ChangeRequest.status == status)
+    """List change requests with optional filters; eager names relationships to preload"""
+    stmt = _LIST_CHANGE_REQUEST_STATEMENTS[(task_id is not None, status is not None)]
+    if eager:
+        stmt = stmt.options(*_eager_options(ChangeRequest, eager))
     
-    return query.order_by(desc(ChangeRequest.created_at)).offset(skip).limit(limit).all()
+    params = {"task_id": task_id, "status": status, "skip": skip, "limit": limit}
+    return list(db.execute(stmt, params).scalars())
 
 
 def update_change_request(db: Session, cr_id: int, **kwargs) -> Optional[ChangeRequest]:
     """Update change request fields"""
-    cr = get_change_request(db, cr_id)
-    if not cr:
-        return None
-    
-    for key, value in kwargs.items():
-        if hasattr(cr, key):
-            setattr(cr, key, value)
-    
-    db.commit()
-    db.refresh(cr)
-    return cr
+    return _update_columns(db, ChangeRequest, ChangeRequest.id, cr_id, kwargs)
 
 
 def submit_change_request(db: Session, cr_id: int) -> Optional[ChangeRequest]:
@@ -310,11 +524,15 @@ def create_approval(
         comment=comment
     )
     db.add(approval)
-    db.commit()
-    db.refresh(approval)
+    _commit(db)
     return approval
 
 
+def bulk_create_approvals(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Create many approval records in one transaction; returns number of rows inserted"""
+    return _bulk_insert(db, Approval, rows)
+
+
 def get_approval(db: Session, approval_id: int) -> Optional[Approval]:
     """Get approval by ID"""
     return db.query(Approval).filter(Approval.id == approval_id).first()
@@ -323,17 +541,27 @@ def get_approval(db: Session, approval_id: int) -> Optional[Approval]:
 def list_approvals(
     db: Session,
     task_id: Optional[int] = None,
-    change_request_id: Optional[int] = None
+    change_request_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = 100
 ) -> List[Approval]:
-    """List approvals with optional filters"""
-    query = db.query(Approval)
+    """
+    List approvals newest first, one keyset page at a time.
+
+    Args:
+        before_id: Only return approvals with a smaller id (id of the last row of the previous page)
+        limit: Maximum number of approvals to return
+    """
+    stmt = select(Approval)
     
     if task_id is not None:
-        query = query.filter(Approval.task_id == task_id)
+        stmt = stmt.where(Approval.task_id == task_id)
     if change_request_id is not None:
-        query = query.filter(Approval.change_request_id == change_request_id)
+        stmt = stmt.where(Approval.change_request_id == change_request_id)
+    if before_id is not None:
+        stmt = stmt.where(Approval.id < before_id)
     
-    return query.order_by(desc(Approval.created_at)).all()
+    return list(db.execute(stmt.order_by(desc(Approval.id)).limit(limit)).scalars())
 
 
 # ==================== ARTIFACT DAO ====================
@@ -347,7 +575,8 @@ def create_artifact(
     task_id: Optional[int] = None,
     run_id: Optional[int] = None,
     sha256: Optional[str] = None,
-    extra_data: Optional[str] = None
+    extra_data: Optional[dict] = None,
+    blake3: Optional[str] = None
 ) -> Artifact:
     """Create a new artifact"""
     artifact = Artifact(
@@ -358,17 +587,23 @@ def create_artifact(
         name=name,
         file_path=file_path,
         sha256=sha256,
+        blake3=blake3,
         extra_data=extra_data
     )
     db.add(artifact)
-    db.commit()
-    db.refresh(artifact)
+    _commit(db)
     return artifact
 
 
+def bulk_create_artifacts(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Create many artifacts in one transaction; returns number of rows inserted"""
+    return _bulk_insert(db, Artifact, rows)
+
+
 def get_artifact(db: Session, artifact_id: int) -> Optional[Artifact]:
     """Get artifact by ID"""
-    return db.query(Artifact).filter(Artifact.id == artifact_id).first()
+    stmt = lambda_stmt(lambda: select(Artifact).where(Artifact.id == artifact_id))
+    return db.execute(stmt).scalars().first()
 
 
 def list_artifacts(
@@ -378,32 +613,57 @@ def list_artifacts(
     run_id: Optional[int] = None,
     artifact_type: Optional[ArtifactType] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    eager: Optional[Sequence[str]] = None
 ) -> List[Artifact]:
-    """List artifacts with optional filters"""
-    query = db.query(Artifact)
+    """List artifacts with optional filters; eager names relationships to preload"""
+    stmt = lambda_stmt(lambda: select(Artifact))
     
     if project_id is not None:
-        query = query.filter(Artifact.project_id == project_id)
+        stmt += lambda s: s.where(Artifact.project_id == project_id)
+    if task_id is not None:
+        stmt += lambda s: s.where(Artifact.task_id == task_id)
+    if run_id is not None:
+        stmt += lambda s: s.where(Artifact.run_id == run_id)
+    if artifact_type is not None:
+        stmt += lambda s: s.where(Artifact.artifact_type == artifact_type)
+    if eager:
+        options = _eager_options(Artifact, eager)
+        stmt += lambda s: s.options(*options)
+    
+    stmt += lambda s: s.order_by(desc(Artifact.created_at)).offset(skip).limit(limit)
+    return list(db.execute(stmt).scalars())
+
+
+def iter_artifacts(
+    db: Session,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    run_id: Optional[int] = None,
+    artifact_type: Optional[ArtifactType] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[Artifact]:
+    """Stream artifacts in batches without materializing the whole result"""
+    stmt = select(Artifact)
+    if project_id is not None:
+        stmt = stmt.where(Artifact.project_id == project_id)
     if task_id is not None:
-        query = query.filter(Artifact.task_id == task_id)
+        stmt = stmt.where(Artifact.task_id == task_id)
     if run_id is not None:
-        query = query.filter(Artifact.run_id == run_id)
+        stmt = stmt.where(Artifact.run_id == run_id)
     if artifact_type is not None:
-        query = query.filter(Artifact.artifact_type == artifact_type)
+        stmt = stmt.where(Artifact.artifact_type == artifact_type)
     
-    return query.order_by(desc(Artifact.created_at)).offset(skip).limit(limit).all()
+    stmt = stmt.order_by(Artifact.id).execution_options(yield_per=batch_size)
+    yield from db.scalars(stmt)
 
 
 def delete_artifact(db: Session, artifact_id: int) -> bool:
     """Delete an artifact"""
-    artifact = get_artifact(db, artifact_id)
-    if not artifact:
-        return False
-    
-    db.delete(artifact)
-    db.commit()
-    return True
+    # Artifacts own no cascaded rows, so a bulk DELETE is equivalent to db.delete()
+    result = db.execute(delete(Artifact).where(Artifact.id == artifact_id))
+    _commit(db)
+    return result.rowcount > 0
 
 
 # ==================== RUN DAO ====================
@@ -413,7 +673,7 @@ def create_run(
     task_id: int,
     engine: str,
     log_path: Optional[str] = None,
-    extra_data: Optional[str] = None
+    extra_data: Optional[dict] = None
 ) -> Run:
     """Create a new run"""
     run = Run(
@@ -425,14 +685,21 @@ def create_run(
         start_time=datetime.utcnow()
     )
     db.add(run)
-    db.commit()
-    db.refresh(run)
+    _commit(db)
     return run
 
 
+def bulk_create_runs(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Create many runs in one transaction; returns number of rows inserted"""
+    now = datetime.utcnow()
+    rows = [{"status": RunStatus.RUNNING, "start_time": now, **row} for row in rows]
+    return _bulk_insert(db, Run, rows)
+
+
 def get_run(db: Session, run_id: int) -> Optional[Run]:
     """Get run by ID"""
-    return db.query(Run).filter(Run.id == run_id).first()
+    stmt = lambda_stmt(lambda: select(Run).where(Run.id == run_id))
+    return db.execute(stmt).scalars().first()
 
 
 def list_runs(
@@ -443,42 +710,64 @@ def list_runs(
     limit: int = 100
 ) -> List[Run]:
     """List runs with optional filters"""
-    query = db.query(Run)
+    stmt = lambda_stmt(lambda: select(Run))
     
     if task_id is not None:
-        query = query.filter(Run.task_id == task_id)
+        stmt += lambda s: s.where(Run.task_id == task_id)
     if status is not None:
-        query = query.filter(Run.status == status)
+        stmt += lambda s: s.where(Run.status == status)
     
-    return query.order_by(desc(Run.start_time)).offset(skip).limit(limit).all()
+    stmt += lambda s: s.order_by(desc(Run.start_time)).offset(skip).limit(limit)
+    return list(db.execute(stmt).scalars())
+
+
+def iter_runs(
+    db: Session,
+    task_id: Optional[int] = None,
+    status: Optional[RunStatus] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[Run]:
+    """Stream runs in batches without materializing the whole result"""
+    stmt = select(Run)
+    if task_id is not None:
+        stmt = stmt.where(Run.task_id == task_id)
+    if status is not None:
+        stmt = stmt.where(Run.status == status)
+    
+    stmt = stmt.order_by(Run.id).execution_options(yield_per=batch_size)
+    yield from db.scalars(stmt)
 
 
 def update_run(db: Session, run_id: int, **kwargs) -> Optional[Run]:
     """Update run fields"""
-    run = get_run(db, run_id)
-    if not run:
-        return None
-    
-    for key, value in kwargs.items():
-        if hasattr(run, key):
-            setattr(run, key, value)
-    
     # Set end_time if status is final
-    if 'status' in kwargs and kwargs['status'] in [RunStatus.SUCCESS, RunStatus.FAILURE, RunStatus.TIMEOUT, RunStatus.CANCELLED]:
-        run.end_time = datetime.utcnow()
+    if kwargs.get('status') in FINAL_RUN_STATUSES:
+        kwargs['end_time'] = datetime.utcnow()
     
-    db.commit()
-    db.refresh(run)
-    return run
+    return _update_columns(db, Run, Run.id, run_id, kwargs)
 
 
-def complete_run(db: Session, run_id: int, status: RunStatus, gate_results: Optional[str] = None) -> Optional[Run]:
+def complete_run(db: Session, run_id: int, status: RunStatus, gate_results: Optional[dict] = None) -> Optional[Run]:
     """Complete a run with final status and gate results"""
     return update_run(db, run_id, status=status, gate_results=gate_results)
 
 
 # ==================== CONTROL STATE DAO ====================
 
+# Dialect-specific INSERT constructs supporting ON CONFLICT upserts
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+# Scalar column defaults of ControlState, for the insert half of the upsert
+_CONTROL_STATE_DEFAULTS = {
+    column.key: column.default.arg
+    for column in ControlState.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+
 def create_control_state(
     db: Session,
     project_id: int,
@@ -493,29 +782,45 @@ def create_control_state(
         timeout_seconds=timeout_seconds
     )
     db.add(control)
-    db.commit()
-    db.refresh(control)
+    _commit(db)
     return control
 
 
 def get_control_state(db: Session, project_id: int) -> Optional[ControlState]:
     """Get control state for a project"""
-    return db.query(ControlState).filter(ControlState.project_id == project_id).first()
+    stmt = lambda_stmt(lambda: select(ControlState).where(ControlState.project_id == project_id))
+    return _cached_get(db, ControlState, project_id, lambda: db.execute(stmt).scalars().first())
 
 
 def update_control_state(db: Session, project_id: int, **kwargs) -> Optional[ControlState]:
-    """Update control state fields"""
-    control = get_control_state(db, project_id)
+    """Update control state fields, creating the row if needed"""
+    _invalidate(db, ControlState, project_id)
+    
+    columns = sa_inspect(ControlState).column_attrs.keys()
+    values = {k: v for k, v in kwargs.items() if k in columns and k != "project_id"}
+    insert_fn = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert_fn is not None and values:
+        # Single atomic INSERT ... ON CONFLICT (project_id) DO UPDATE
+        stmt = (
+            insert_fn(ControlState)
+            .values({**_CONTROL_STATE_DEFAULTS, **values, "project_id": project_id})
+            .on_conflict_do_update(
+                index_elements=[ControlState.project_id],
+                set_={**values, "updated_at": func.now()}
+            )
+            .returning(ControlState)
+            .execution_options(populate_existing=True)
+        )
+        control = db.scalars(stmt).one()
+        _commit(db)
+        return control
+    
+    control = _update_columns(db, ControlState, ControlState.project_id, project_id, kwargs)
     if not control:
         # Create if doesn't exist
         control = create_control_state(db, project_id)
-    
-    for key, value in kwargs.items():
-        if hasattr(control, key):
-            setattr(control, key, value)
-    
-    db.commit()
-    db.refresh(control)
+        if kwargs:
+            control = _update_columns(db, ControlState, ControlState.project_id, project_id, kwargs)
     return control
 
 
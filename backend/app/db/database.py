@@ -5,66 +5,200 @@ Also supports a unified test mode for easier testing.
 """
 
 from pathlib import Path
+import asyncio
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool, QueuePool, StaticPool
-from typing import Generator, Optional
-from threading import Lock
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, Generator, Iterable, Optional
+from threading import Lock, RLock
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
+import fcntl
 import os
-import subprocess
-import sys
+import re
+import sqlite3
+
+import orjson
 
 from app.models import Base
 from app.core.config import DatabaseConfig
 
+if TYPE_CHECKING:
+    from alembic.script import ScriptDirectory
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+_ALEMBIC_DIR = Path(__file__).parent.parent.parent / "alembic"
+_ALEMBIC_INI = Path(__file__).parent.parent.parent / "alembic.ini"
+
+# alembic's migration context is module-global, so upgrades must not overlap
+_migration_lock = Lock()
+
+# First key of the PostgreSQL advisory lock held while a project migrates
+# (the second is the project id), so uvicorn workers don't race each other
+_MIGRATION_ADVISORY_NS = 0x43444456
+
+
+# alembic is imported lazily: test mode and already-open projects never migrate
+@lru_cache(maxsize=1)
+def _alembic_script() -> "ScriptDirectory":
+    """Parse the migration scripts once per process"""
+    from alembic.script import ScriptDirectory
+    
+    return ScriptDirectory(str(_ALEMBIC_DIR))
+
+
+def is_at_head(engine) -> bool:
+    """Check whether a database is already at the latest migration"""
+    from alembic.runtime.migration import MigrationContext
+    
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+    return current == _alembic_script().get_current_head()
+
+
+@contextmanager
+def _sqlite_migration_file_lock(engine):
+    """Hold an exclusive flock beside a SQLite database file (no-op otherwise)"""
+    database = engine.url.database
+    if engine.url.get_backend_name() != "sqlite" or not database or database == ":memory:":
+        yield
+        return
+    with open(f"{database}.migrate.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 
-def run_migrations(db_url: str, project_id: int) -> None:
+def run_migrations(engine, project_id: int) -> None:
     """
-    Run alembic migrations for a database.
-    For PostgreSQL, temporarily sets the schema before running migrations.
+    Run alembic migrations for a database, in-process.
+    
+    Migrations run on a connection from the project's own engine, so for
+    PostgreSQL they apply to the schema its search_path selects. Worker
+    processes are serialized by an advisory lock (PostgreSQL) or a file
+    lock (SQLite); the one that waits finds the database at head.
     """
-    alembic_dir = Path(__file__).parent.parent.parent / "alembic"
-    alembic_ini = Path(__file__).parent.parent.parent / "alembic.ini"
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
     
-    if not alembic_ini.exists():
-        raise FileNotFoundError(f"Alembic config not found: {alembic_ini}")
+    if not _ALEMBIC_INI.exists():
+        raise FileNotFoundError(f"Alembic config not found: {_ALEMBIC_INI}")
     
-    # Use subprocess to run alembic upgrade head
-    env = os.environ.copy()
-    env["ALEMBIC_DB_URL"] = db_url
+    config = AlembicConfig(str(_ALEMBIC_INI))
+    config.set_main_option("script_location", str(_ALEMBIC_DIR))
+    config.attributes["configure_logger"] = False
     
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "alembic", "-c", str(alembic_ini), "upgrade", "head"],
-            cwd=alembic_dir.parent,
-            env=env,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Migration failed: {e.stderr}") from e
+        with _migration_lock, _sqlite_migration_file_lock(engine), engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                # Released when the migration transaction commits
+                connection.execute(
+                    text("SELECT pg_advisory_xact_lock(:ns, :project_id)"),
+                    {"ns": _MIGRATION_ADVISORY_NS, "project_id": project_id},
+                )
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+    except Exception as e:
+        raise RuntimeError(f"Migration failed: {e}") from e
+
+
+# Applied to every new SQLite connection. foreign_keys is left off on purpose:
+# Artifact.task_id has no ORM-level cascade and would block task deletes.
+SQLITE_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# File databases only; WAL and mmap do not apply to :memory:
+SQLITE_FILE_PRAGMAS = SQLITE_PRAGMAS + (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _sqlite_pragma_listener(pragmas: tuple):
+    """Build a connect listener that applies PRAGMAs once per new connection"""
+    script = "".join(f"{pragma};" for pragma in pragmas)
+    
+    def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.executescript(script)
+        finally:
+            cursor.close()
+    
+    return set_sqlite_pragmas
+
+
+_set_sqlite_pragmas = _sqlite_pragma_listener(SQLITE_FILE_PRAGMAS)
+_set_sqlite_memory_pragmas = _sqlite_pragma_listener(SQLITE_PRAGMAS)
+
+
+def _json_dumps(value) -> str:
+    """JSON column serializer (orjson; non-string keys stringified like json.dumps)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON/JSONB column (de)serialization for every engine
+_JSON_ENGINE_KWARGS = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
+
+_SCHEMA_NAME_RE = re.compile(r"project_\d+")
+
+
+@lru_cache(maxsize=1024)
+def _schema_name(project_id: int) -> str:
+    """PostgreSQL schema name for a project"""
+    return f"project_{project_id}"
+
+
+def _search_path_option(schema_name: str) -> str:
+    """libpq startup option that pins every new connection to a project schema"""
+    if not _SCHEMA_NAME_RE.fullmatch(schema_name):
+        raise ValueError(f"Invalid schema name: {schema_name}")
+    return f"-csearch_path={schema_name}"
 
 
 class DatabaseManager:
     """Manages database connections for projects"""
     
+    # Least recently used project engines beyond this are disposed. SQLite
+    # projects keep one engine each rather than ATTACHing every project file
+    # to a shared engine: SQLite allows only 10 attached databases by default
+    # (125 at most), and each file has its own alembic version. This bound
+    # caps engine memory and file handles instead.
+    max_open_engines: int = 128
+    
     def __init__(self, db_config: Optional[DatabaseConfig] = None, test_mode: bool = False):
         self.db_config = db_config or DatabaseConfig()
         self.test_mode = test_mode or os.getenv("TEST_MODE", "").lower() == "true"
-        self.engines = {}
+        self.engines = OrderedDict()  # LRU order, oldest first
         self.session_makers = {}
-        self._lock = Lock()  # Thread synchronization for dictionary access
+        self.async_engines = {}  # PostgreSQL only, see get_async_session
+        self.async_session_makers = {}
+        self._database_urls = {}  # project_id -> URL, reset by configure()
+        self._lock = RLock()  # Serializes project initialization and teardown
+        self._init_locks: Dict[int, asyncio.Lock] = {}  # Per-project async init guards
         
         # In test mode, use a single shared engine
         if self.test_mode:
             self._test_engine = None
             self._test_session_maker = None
+            self._test_template = None  # Empty-schema snapshot for reset_test_database
         else:
             # For SQLite, ensure base path exists
             if self.db_config.type == "sqlite":
-                self.db_base_path = Path(self.db_config.path)
-                self.db_base_path.mkdir(parents=True, exist_ok=True)
+                self._set_base_path(self.db_config.path)
+    
+    def _set_base_path(self, path: str) -> None:
+        """Point SQLite project files at a directory, creating it if needed"""
+        self.db_base_path = Path(path)
+        self.db_base_path.mkdir(parents=True, exist_ok=True)
     
     def _init_test_database(self):
         """Initialize a single shared database for all projects in test mode"""
@@ -76,51 +210,87 @@ class DatabaseManager:
                 "sqlite:///:memory:",
                 echo=False,
                 connect_args={"check_same_thread": False},
-                poolclass=StaticPool
+                poolclass=StaticPool,
+                **_JSON_ENGINE_KWARGS
             )
+            event.listen(self._test_engine, "connect", _set_sqlite_memory_pragmas)
             # In test mode, use create_all for speed (migrations not needed for tests)
             Base.metadata.create_all(bind=self._test_engine)
+            self._test_template = sqlite3.connect(":memory:", check_same_thread=False)
+            self._copy_test_database(to_template=True)
             self._test_session_maker = sessionmaker(
                 autocommit=False,
                 autoflush=False,
+                expire_on_commit=False,
                 bind=self._test_engine
             )
     
     def _build_database_url(self, project_id: int) -> str:
         """Build database URL based on configuration type"""
+        url = self._database_urls.get(project_id)
+        if url is None:
+            url = self._database_urls[project_id] = self._make_database_url(project_id)
+        return url
+    
+    def _make_database_url(self, project_id: int) -> str:
+        """Format the database URL for a project"""
         if self.db_config.type == "sqlite":
             db_path = self.db_base_path / f"project_{project_id}.db"
             return f"sqlite:///{db_path}"
         elif self.db_config.type == "postgresql":
-            # PostgreSQL uses schemas for project isolation
-            return (
-                f"postgresql://{self.db_config.username}:{self.db_config.password}"
-                f"@{self.db_config.host}:{self.db_config.port}/{self.db_config.database}"
-            )
+            # PostgreSQL uses schemas for project isolation; all projects share one URL
+            return self._postgres_url
         else:
             raise ValueError(f"Unsupported database type: {self.db_config.type}")
     
+    @cached_property
+    def _postgres_url(self) -> str:
+        """Server URL for the current config (reset by configure())"""
+        return (
+            f"postgresql://{self.db_config.username}:{self.db_config.password}"
+            f"@{self.db_config.host}:{self.db_config.port}/{self.db_config.database}"
+        )
+    
     def _get_engine_kwargs(self) -> dict:
         """Get engine-specific connection arguments"""
         if self.db_config.type == "sqlite":
+            if not self.db_config.sqlite_pooling:
+                return {
+                    **_JSON_ENGINE_KWARGS,
+                    "connect_args": {"check_same_thread": False, "timeout": 30},
+                    "poolclass": NullPool,
+                }
+            # Pool file connections so PRAGMAs, schema and statement caches persist
             return {
-                "connect_args": {"check_same_thread": False},
-                "poolclass": NullPool,  # SQLite doesn't need connection pooling
+                **_JSON_ENGINE_KWARGS,
+                "connect_args": {"check_same_thread": False, "timeout": 30},
+                "poolclass": QueuePool,
+                "pool_size": self.db_config.pool_size,
+                "max_overflow": self.db_config.max_overflow,
+                "pool_timeout": self.db_config.pool_timeout,
             }
         elif self.db_config.type == "postgresql":
             return {
+                **_JSON_ENGINE_KWARGS,
                 "poolclass": QueuePool,
                 "pool_size": self.db_config.pool_size,
                 "max_overflow": self.db_config.max_overflow,
                 "pool_timeout": self.db_config.pool_timeout,
+                "pool_recycle": self.db_config.pool_recycle,  # Drop connections before server idle timeouts
                 "pool_pre_ping": True,  # Verify connections before use
+                "connect_args": {"application_name": "change-driven-dev"},
             }
         else:
             return {}
     
+    @cached_property
+    def _engine_kwargs(self) -> dict:
+        """Engine kwargs for the current config (reset by configure())"""
+        return self._get_engine_kwargs()
+    
     def _get_schema_name(self, project_id: int) -> str:
         """Get PostgreSQL schema name for a project"""
-        return f"project_{project_id}"
+        return _schema_name(project_id)
     
     def get_db_path(self, project_id: int) -> str:
         """Get database path/identifier for a project"""
@@ -132,50 +302,59 @@ class DatabaseManager:
         else:
             return self._get_schema_name(project_id)
     
-    def init_project_db(self, project_id: int) -> None:
-        """Initialize database for a project"""
+    def init_project_db(self, project_id: int, migrate: Optional[bool] = None) -> None:
+        """
+        Initialize database for a project.
+        
+        migrate=None checks the database's alembic version first; callers
+        that already know (bulk_init_project_dbs) pass True or False.
+        """
         # In test mode, skip per-project initialization
         if self.test_mode:
             self._init_test_database()
             return
         
         db_url = self._build_database_url(project_id)
-        engine_kwargs = self._get_engine_kwargs()
+        engine_kwargs = self._engine_kwargs
+        if self.db_config.type == "postgresql":
+            # search_path is set at connection startup, so no SET round trip is needed
+            engine_kwargs = {
+                **engine_kwargs,
+                "connect_args": {
+                    **engine_kwargs.get("connect_args", {}),
+                    "options": _search_path_option(self._get_schema_name(project_id)),
+                },
+            }
         
         engine = create_engine(db_url, echo=False, **engine_kwargs)
+        if self.db_config.type == "sqlite":
+            event.listen(engine, "connect", _set_sqlite_pragmas)
         
         # For PostgreSQL, create schema if it doesn't exist
-        if self.db_config.type == "postgresql":
+        if self.db_config.type == "postgresql" and migrate is not False:
             schema_name = self._get_schema_name(project_id)
             with engine.connect() as conn:
                 conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema_name}"))
                 conn.commit()
-            
-            # Run migrations in the project schema
-            # Note: Alembic will handle setting the schema via search_path
-            run_migrations(db_url, project_id)
-        else:
-            # SQLite: run migrations to create/update schema
-            run_migrations(db_url, project_id)
         
-        self.engines[project_id] = engine
-        self.session_makers[project_id] = sessionmaker(
-            autocommit=False, 
-            autoflush=False, 
-            bind=engine
-        )
+        # Run migrations (in the project schema for PostgreSQL) unless already at head
+        if migrate is None:
+            migrate = not is_at_head(engine)
+        if migrate:
+            run_migrations(engine, project_id)
         
-        # For PostgreSQL, set search_path for sessions
-        if self.db_config.type == "postgresql":
-            schema_name = self._get_schema_name(project_id)
-            session_maker = self.session_makers[project_id]
-            
-            @event.listens_for(session_maker, "before_cursor_execute", retval=True)
-            def set_search_path(conn, cursor, statement, parameters, context, executemany):
-                if not hasattr(conn, "_search_path_set"):
-                    cursor.execute(f"SET search_path TO {schema_name}")
-                    conn._search_path_set = True
-                return statement, parameters
+        with self._lock:
+            self.engines[project_id] = engine
+            # DAO create_* return instances straight from INSERT ... RETURNING;
+            # expiring them on commit would cost a SELECT on first access
+            self.session_makers[project_id] = sessionmaker(
+                autocommit=False, 
+                autoflush=False, 
+                expire_on_commit=False,
+                bind=engine
+            )
+            while len(self.engines) > self.max_open_engines:
+                self.close_project_db(next(iter(self.engines)))
     
     def get_session(self, project_id: int) -> Generator[Session, None, None]:
         """Get database session for a project"""
@@ -190,62 +369,249 @@ class DatabaseManager:
                 db.close()
             return
         
-        # Normal mode: per-project databases
-        if project_id not in self.session_makers:
-            with self._lock:
-                # Double-check after acquiring lock to prevent race conditions
-                if project_id not in self.session_makers:
-                    self.init_project_db(project_id)
-        
-        SessionLocal = self.session_makers[project_id]
+        # Normal mode: per-project databases; lock only on first use
+        SessionLocal = self.session_makers.get(project_id)
+        if SessionLocal is None:
+            SessionLocal = self._get_or_init_session_maker(project_id)
+        else:
+            try:
+                self.engines.move_to_end(project_id)
+            except KeyError:
+                pass  # Evicted concurrently; the session maker still works
         db = SessionLocal()
         try:
             yield db
         finally:
             db.close()
     
+    def engine_for(self, project_id: int):
+        """Get the pooled engine for a project, initializing it on first use"""
+        if self.test_mode:
+            self._init_test_database()
+            return self._test_engine
+        SessionLocal = self.session_makers.get(project_id)
+        if SessionLocal is None:
+            SessionLocal = self._get_or_init_session_maker(project_id)
+        return SessionLocal.kw["bind"]
+    
+    async def ensure_project_db(self, project_id: int) -> None:
+        """
+        Initialize a project database off the event loop.
+        
+        Migrations and engine setup run in a worker thread; concurrent
+        requests for the same project wait on one initialization.
+        """
+        if self.test_mode:
+            if self._test_session_maker is None:
+                self._init_test_database()
+            return
+        if project_id in self.session_makers:
+            return
+        
+        lock = self._init_locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            if project_id not in self.session_makers:
+                await asyncio.to_thread(self._get_or_init_session_maker, project_id)
+    
+    async def get_async_session(self, project_id: int) -> AsyncGenerator["AsyncSession", None]:
+        """
+        Get an asyncpg-backed session for a PostgreSQL project.
+        
+        Queries run on the event loop instead of the thread pool. The
+        schema is created and migrated through the sync engine first.
+        """
+        if self.test_mode or self.db_config.type != "postgresql":
+            raise ValueError("Async sessions require a PostgreSQL database")
+        
+        await self.ensure_project_db(project_id)
+        AsyncSessionLocal = self.async_session_makers.get(project_id)
+        if AsyncSessionLocal is None:
+            AsyncSessionLocal = self._init_async_session_maker(project_id)
+        async with AsyncSessionLocal() as db:
+            yield db
+    
+    def _init_async_session_maker(self, project_id: int) -> "async_sessionmaker":
+        """Create the asyncpg engine for a PostgreSQL project, once"""
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        
+        # Re-checked under the lock so concurrent callers share one engine;
+        # create_async_engine doesn't connect, so the lock is held briefly
+        with self._lock:
+            session_maker = self.async_session_makers.get(project_id)
+            if session_maker is not None:
+                return session_maker
+            
+            engine = create_async_engine(
+                self._postgres_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+                echo=False,
+                **_JSON_ENGINE_KWARGS,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=self.db_config.pool_size,
+                max_overflow=self.db_config.max_overflow,
+                pool_timeout=self.db_config.pool_timeout,
+                pool_recycle=self.db_config.pool_recycle,
+                pool_pre_ping=True,
+                # asyncpg sends these as startup parameters, like the libpq options
+                connect_args={
+                    "server_settings": {
+                        "application_name": "change-driven-dev",
+                        "search_path": self._get_schema_name(project_id),
+                    },
+                },
+            )
+            self.async_engines[project_id] = engine
+            session_maker = self.async_session_makers[project_id] = async_sessionmaker(
+                engine,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return session_maker
+    
+    def bulk_init_project_dbs(self, project_ids: Iterable[int], workers: int = 6) -> None:
+        """
+        Initialize many project databases concurrently.
+        
+        Alembic versions are read for all projects up front; connection
+        setup overlaps across projects and migrations run one at a time.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if self.test_mode:
+            self._init_test_database()
+            return
+        
+        pending = sorted(set(project_ids) - set(self.session_makers))
+        unmigrated = set(self._find_unmigrated(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                lambda project_id: self.init_project_db(project_id, migrate=project_id in unmigrated),
+                pending,
+            ))
+    
+    def _find_unmigrated(self, project_ids: list[int], batch_size: int = 50) -> list[int]:
+        """Return the projects whose database is missing or not at the latest migration"""
+        head = _alembic_script().get_current_head()
+        if self.db_config.type == "postgresql":
+            versions = self._read_postgres_versions(project_ids, batch_size)
+        else:
+            versions = self._read_sqlite_versions(project_ids)
+        return [project_id for project_id in project_ids if versions.get(project_id) != head]
+    
+    def _read_sqlite_versions(self, project_ids: list[int]) -> Dict[int, str]:
+        """Read alembic versions straight from the project files, without engines"""
+        versions = {}
+        for project_id in project_ids:
+            db_path = self.db_base_path / f"project_{project_id}.db"
+            if not db_path.exists():
+                continue
+            conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+            except sqlite3.OperationalError:
+                row = None  # No alembic_version table yet
+            finally:
+                conn.close()
+            if row is not None:
+                versions[project_id] = row[0]
+        return versions
+    
+    def _read_postgres_versions(self, project_ids: list[int], batch_size: int) -> Dict[int, str]:
+        """Read alembic versions for all project schemas in one query per batch"""
+        schemas = {self._get_schema_name(project_id): project_id for project_id in project_ids}
+        versions = {}
+        engine = create_engine(self._postgres_url, poolclass=NullPool)
+        try:
+            with engine.connect() as conn:
+                found = conn.execute(
+                    text(
+                        "SELECT table_schema FROM information_schema.tables "
+                        "WHERE table_name = 'alembic_version' AND table_schema = ANY(:schemas)"
+                    ),
+                    {"schemas": list(schemas)},
+                ).scalars().all()
+                for start in range(0, len(found), batch_size):
+                    # Schema names come from _schema_name, so they are safe to inline
+                    query = " UNION ALL ".join(
+                        f"SELECT '{schema}', version_num FROM {schema}.alembic_version"
+                        for schema in found[start:start + batch_size]
+                    )
+                    for schema, version in conn.execute(text(query)):
+                        versions[schemas[schema]] = version
+        finally:
+            engine.dispose()
+        return versions
+    
+    def _get_or_init_session_maker(self, project_id: int) -> sessionmaker:
+        """Initialize a project database under the lock if no other thread has"""
+        with self._lock:
+            if project_id not in self.session_makers:
+                self.init_project_db(project_id)
+            return self.session_makers[project_id]
+    
     def configure(self, db_config: DatabaseConfig) -> None:
         """Update database configuration (for runtime reconfiguration)"""
         self.db_config = db_config
+        for cached in ("_engine_kwargs", "_postgres_url"):
+            self.__dict__.pop(cached, None)
+        self._database_urls.clear()
         if db_config.type == "sqlite" and not self.test_mode:
-            self.db_base_path = Path(db_config.path)
-            self.db_base_path.mkdir(parents=True, exist_ok=True)
+            self._set_base_path(db_config.path)
     
     def enable_test_mode(self):
         """Enable test mode (uses single shared in-memory database)"""
         self.test_mode = True
         self._test_engine = None
         self._test_session_maker = None
+        self._test_template = None
     
     def disable_test_mode(self):
         """Disable test mode (back to per-project databases)"""
         self.test_mode = False
         if hasattr(self, '_test_engine') and self._test_engine:
             self._test_engine.dispose()
+        if getattr(self, '_test_template', None):
+            self._test_template.close()
         self._test_engine = None
         self._test_session_maker = None
+        self._test_template = None
+    
+    def _copy_test_database(self, to_template: bool) -> None:
+        """Copy database pages between the test engine and its snapshot"""
+        raw = self._test_engine.raw_connection()
+        try:
+            if to_template:
+                raw.driver_connection.backup(self._test_template)
+            else:
+                self._test_template.backup(raw.driver_connection)
+        finally:
+            raw.close()
     
     def cleanup_test_database(self):
         """Clear all data from test database (for test isolation between tests)"""
-        if self.test_mode and self._test_session_maker:
-            session = self._test_session_maker()
+        if self.test_mode and self._test_engine:
+            # One script and one transaction for all tables, deleting in
+            # reverse order to handle foreign key constraints
+            preparer = self._test_engine.dialect.identifier_preparer
+            script = "BEGIN;\n" + "".join(
+                f"DELETE FROM {preparer.format_table(table)};\n"
+                for table in reversed(Base.metadata.sorted_tables)
+            ) + "COMMIT;"
+            raw = self._test_engine.raw_connection()
             try:
-                # Delete in reverse order to handle foreign key constraints
-                for table in reversed(Base.metadata.sorted_tables):
-                    session.execute(table.delete())
-                session.commit()
+                raw.driver_connection.executescript(script)
             except Exception:
-                session.rollback()
+                raw.driver_connection.rollback()
                 raise
             finally:
-                session.close()
+                raw.close()
     
     def reset_test_database(self):
-        """Drop and recreate all tables in test database (full reset)"""
+        """Restore the test database to its freshly created schema (full reset)"""
         if self.test_mode and self._test_engine:
-            Base.metadata.drop_all(bind=self._test_engine)
-            # In test mode, use create_all for speed
-            Base.metadata.create_all(bind=self._test_engine)
+            # Page copy from the snapshot taken after create_all, instead
+            # of re-running every table's DDL
+            self._copy_test_database(to_template=False)
     
     def close_project_db(self, project_id: int) -> None:
         """Close and dispose of a project's database connection"""
@@ -257,6 +623,11 @@ class DatabaseManager:
                     pass  # Ignore errors during disposal
                 del self.engines[project_id]
                 del self.session_makers[project_id]
+            async_engine = self.async_engines.pop(project_id, None)
+            if async_engine is not None:
+                # Closing asyncpg connections needs the event loop; drop the pool instead
+                async_engine.sync_engine.dispose(close=False)
+                del self.async_session_makers[project_id]
 
 
 # Global database manager instance
@@ -265,7 +636,7 @@ db_manager = DatabaseManager()
 
 def get_db(project_id: int = 1) -> Generator[Session, None, None]:
     """Dependency for getting database session"""
-    return db_manager.get_session(project_id)
+    yield from db_manager.get_session(project_id)
 
 
 def get_db_for_project(project_id: int) -> Generator[Session, None, None]:
@@ -273,13 +644,28 @@ def get_db_for_project(project_id: int) -> Generator[Session, None, None]:
     yield from db_manager.get_session(project_id)
 
 
-def get_db_session() -> Generator[Session, None, None]:
+async def get_db_session() -> AsyncGenerator[Session, None]:
     """FastAPI dependency for database session (default project 1).
     
+    The project database is initialized in a worker thread on first use,
+    so cold opens do not block the event loop.
+    
     This is designed to be easily overridden in tests using
     app.dependency_overrides[get_db_session] = override_function
     """
-    yield from db_manager.get_session(1)
+    await db_manager.ensure_project_db(1)
+    sessions = db_manager.get_session(1)
+    db = next(sessions)
+    try:
+        yield db
+    finally:
+        sessions.close()
+
+
+async def get_async_db_for_project(project_id: int) -> AsyncGenerator["AsyncSession", None]:
+    """Get an async database session for a PostgreSQL project"""
+    async for db in db_manager.get_async_session(project_id):
+        yield db
 
 
 def configure_database(db_config: DatabaseConfig) -> None:
@@ -10,6 +10,9 @@ from .engine_base import (
 )
 from .copilot_cli import CopilotCLIEngine
 
+# All implementations are registered at import; no changes after startup
+EngineFactory.freeze()
+
 __all__ = [
     "EngineBase",
     "EngineStatus",
@@ -2,9 +2,11 @@
 GitHub Copilot CLI engine adapter.
 """
 import asyncio
+import codecs
 import json
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any, List, AsyncIterator
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 from pathlib import Path
 
 from .engine_base import (
@@ -12,21 +14,45 @@ from .engine_base import (
     EngineStatus,
     EngineMessage,
     EngineResponse,
-    EngineFactory
+    EngineFactory,
+    coalesce_chunks
 )
 
 
-class CopilotCLIEngine:
+# Bytes read from the child's stdout per streaming iteration
+STREAM_CHUNK_SIZE = 65536
+
+# Streamed output is merged into batches of up to this many characters,
+# each waiting at most STREAM_BATCH_DELAY seconds for more output
+STREAM_BATCH_CHARS = 4096
+STREAM_BATCH_DELAY = 0.010
+
+# Longest JSON reply line accepted from the persistent process (asyncio's default is 64 KiB)
+REPL_LINE_LIMIT = 64 * 1024 * 1024
+
+# Seconds a `copilot --version` health probe result is reused
+HEALTH_CHECK_TTL = 30.0
+
+# (monotonic time of last probe, result); shared by all engine instances
+_health_cache: Tuple[float, bool] = (float("-inf"), False)
+
+
+@EngineFactory.register("copilot_cli")
+class CopilotCLIEngine(EngineBase):
     """
     Adapter for GitHub Copilot CLI.
     
     Uses the `github-copilot-cli` command-line tool for AI assistance.
+    When ``persistent_command`` is given, one long-lived child process is
+    kept for the session and prompts are exchanged over stdin/stdout as
+    newline-delimited JSON; otherwise each prompt spawns ``copilot -p``.
     """
     
     def __init__(
         self,
         working_directory: Optional[str] = None,
         timeout: int = 300,
+        persistent_command: Optional[List[str]] = None,
         **kwargs
     ):
         """
@@ -35,6 +61,9 @@ class CopilotCLIEngine:
         Args:
             working_directory: Directory to execute commands in
             timeout: Command timeout in seconds
+            persistent_command: Command line of a REPL speaking
+                newline-delimited JSON ({"prompt": ...} in,
+                {"output": ..., "error": ...} out)
             **kwargs: Additional configuration options
         """
         self._engine_name = "copilot_cli"
@@ -42,8 +71,14 @@ class CopilotCLIEngine:
         self._working_directory = Path(working_directory) if working_directory else Path.cwd()
         self._timeout = timeout
         self._transcript: List[EngineMessage] = []
+        # Transcript version at which the current session started; versions
+        # keep counting across sessions so stale ones are never mistaken
+        self._session_epoch = 0
         self._process: Optional[asyncio.subprocess.Process] = None
         self._session_id: Optional[str] = None
+        self._persistent_command = persistent_command
+        self._repl: Optional[asyncio.subprocess.Process] = None
+        self._repl_lock = asyncio.Lock()
         
     @property
     def engine_name(self) -> str:
@@ -68,6 +103,7 @@ class CopilotCLIEngine:
         """
         try:
             self._session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            self._session_epoch = self._transcript_version
             self._transcript = []
             
             # Update working directory if provided in context
@@ -78,11 +114,13 @@ class CopilotCLIEngine:
             system_msg = EngineMessage(
                 role="system",
                 content=f"Session started in {self._working_directory}",
-                timestamp=datetime.now().isoformat(),
+                timestamp=time.time_ns(),
                 metadata={"session_id": self._session_id}
             )
             self._transcript.append(system_msg)
             
+            await self._start_repl()
+            
             # If initial prompt provided, execute it
             if context and "initial_prompt" in context:
                 initial_response = await self.execute(context["initial_prompt"])
@@ -139,7 +177,7 @@ class CopilotCLIEngine:
             user_msg = EngineMessage(
                 role="user",
                 content=command,
-                timestamp=datetime.now().isoformat()
+                timestamp=time.time_ns()
             )
             self._transcript.append(user_msg)
             
@@ -152,7 +190,7 @@ class CopilotCLIEngine:
                 assistant_msg = EngineMessage(
                     role="assistant",
                     content=result["output"],
-                    timestamp=datetime.now().isoformat(),
+                    timestamp=time.time_ns(),
                     metadata={"exit_code": result.get("exit_code")}
                 )
                 self._transcript.append(assistant_msg)
@@ -188,21 +226,21 @@ class CopilotCLIEngine:
         **kwargs
     ) -> AsyncIterator[str]:
         """
-        Execute command with streaming (reads output line by line).
+        Execute command with streaming (reads output in chunks).
         
         Args:
             command: The prompt for Copilot
             **kwargs: Additional parameters
             
         Yields:
-            Lines of output as they arrive
+            Decoded output chunks as they arrive
         """
         try:
             # Add user message
             user_msg = EngineMessage(
                 role="user",
                 content=command,
-                timestamp=datetime.now().isoformat()
+                timestamp=time.time_ns()
             )
             self._transcript.append(user_msg)
             
@@ -220,12 +258,15 @@ class CopilotCLIEngine:
             self._process = process
             full_output = []
             
-            # Stream stdout
             if process.stdout:
-                async for line in process.stdout:
-                    line_text = line.decode('utf-8')
-                    full_output.append(line_text)
-                    yield line_text
+                batches = coalesce_chunks(
+                    _decode_stream(process.stdout),
+                    max_delay=STREAM_BATCH_DELAY,
+                    max_chars=STREAM_BATCH_CHARS,
+                )
+                async for text in batches:
+                    full_output.append(text)
+                    yield text
             
             # Wait for completion
             await process.wait()
@@ -234,7 +275,7 @@ class CopilotCLIEngine:
             assistant_msg = EngineMessage(
                 role="assistant",
                 content="".join(full_output),
-                timestamp=datetime.now().isoformat(),
+                timestamp=time.time_ns(),
                 metadata={"exit_code": process.returncode}
             )
             self._transcript.append(assistant_msg)
@@ -245,6 +286,99 @@ class CopilotCLIEngine:
             self._status = EngineStatus.ERROR
             yield f"Error: {str(e)}"
     
+    async def _start_repl(self) -> None:
+        """
+        Spawn the persistent child process if one is configured.
+        
+        Leaves ``self._repl`` unset when the command cannot be started, so
+        prompts fall back to one-shot subprocesses.
+        """
+        if not self._persistent_command or self._repl_alive():
+            return
+        
+        try:
+            self._repl = await asyncio.create_subprocess_exec(
+                *self._persistent_command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=str(self._working_directory),
+                limit=REPL_LINE_LIMIT
+            )
+        except OSError:
+            self._repl = None
+    
+    def _repl_alive(self) -> bool:
+        return self._repl is not None and self._repl.returncode is None
+    
+    async def _stop_repl(self) -> None:
+        repl, self._repl = self._repl, None
+        if repl is not None and repl.returncode is None:
+            repl.kill()
+            await repl.wait()
+    
+    async def _run_repl_command(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Send a prompt to the persistent child process.
+        
+        Returns:
+            Result dict, or None if the process is gone and the caller
+            should fall back to a one-shot subprocess
+        """
+        async with self._repl_lock:
+            if not self._repl_alive():
+                return None
+            
+            try:
+                self._repl.stdin.write(json.dumps({"prompt": prompt}).encode() + b"\n")
+                await self._repl.stdin.drain()
+                line = await asyncio.wait_for(
+                    self._repl.stdout.readline(),
+                    timeout=self._timeout
+                )
+            except asyncio.TimeoutError:
+                # The reply may still arrive later and desync the stream
+                await self._stop_repl()
+                return {
+                    "success": False,
+                    "output": "",
+                    "error": f"Command timed out after {self._timeout}s"
+                }
+            except (ValueError, asyncio.LimitOverrunError):
+                # Over-long reply: asyncio dropped part of it, so the stream is desynced
+                await self._stop_repl()
+                return {
+                    "success": False,
+                    "output": "",
+                    "error": f"Response from persistent copilot process exceeded {REPL_LINE_LIMIT} bytes"
+                }
+            except (BrokenPipeError, ConnectionResetError):
+                await self._stop_repl()
+                return None
+            
+            if not line:
+                await self._stop_repl()
+                return None
+        
+        try:
+            reply = json.loads(line)
+        except json.JSONDecodeError:
+            reply = None
+        if not isinstance(reply, dict):
+            return {
+                "success": False,
+                "output": line.decode('utf-8', errors='replace'),
+                "error": "Invalid response from persistent copilot process"
+            }
+        
+        error = reply.get("error")
+        return {
+            "success": not error,
+            "output": reply.get("output", ""),
+            "error": error,
+            "exit_code": reply.get("exit_code", 1 if error else 0)
+        }
+    
     async def _run_copilot_command(
         self,
         prompt: str,
@@ -253,6 +387,8 @@ class CopilotCLIEngine:
         """
         Run a Copilot CLI command and capture output.
         
+        Uses the persistent child process when available.
+        
         Args:
             prompt: The prompt for Copilot
             **kwargs: Additional parameters
@@ -260,6 +396,11 @@ class CopilotCLIEngine:
         Returns:
             Dict with success, output, exit_code, error
         """
+        if self._repl_alive():
+            result = await self._run_repl_command(prompt)
+            if result is not None:
+                return result
+        
         try:
             # Execute command with -p flag for non-interactive mode
             process = await asyncio.create_subprocess_exec(
@@ -304,6 +445,7 @@ class CopilotCLIEngine:
                 }
                 
         except FileNotFoundError:
+            _invalidate_health_cache()
             return {
                 "success": False,
                 "output": "",
@@ -329,11 +471,13 @@ class CopilotCLIEngine:
                 self._process.kill()
                 await self._process.wait()
             
+            await self._stop_repl()
+            
             # Add termination message
             system_msg = EngineMessage(
                 role="system",
                 content="Session terminated",
-                timestamp=datetime.now().isoformat(),
+                timestamp=time.time_ns(),
                 metadata={"session_id": self._session_id}
             )
             self._transcript.append(system_msg)
@@ -363,7 +507,34 @@ class CopilotCLIEngine:
         Returns:
             List of EngineMessage objects
         """
-        return self._transcript.copy()
+        return list(self._transcript)
+    
+    async def get_transcript_since(
+        self,
+        version: int
+    ) -> Tuple[List[EngineMessage], int]:
+        """
+        Get only the messages appended since a previous read.
+        
+        Versions increase monotonically across sessions. A version from an
+        earlier session returns the whole current transcript.
+        
+        Args:
+            version: Version returned by the previous call, 0 initially
+            
+        Returns:
+            Tuple of new messages and the version to pass next time
+        """
+        end = self._transcript_version
+        start = version - self._session_epoch
+        if start < 0 or version > end:
+            start = 0
+        return self._transcript[start:], end
+    
+    @property
+    def _transcript_version(self) -> int:
+        """Messages appended since the engine was created, across sessions"""
+        return self._session_epoch + len(self._transcript)
     
     async def get_status(self) -> EngineStatus:
         """
@@ -399,9 +570,16 @@ class CopilotCLIEngine:
         """
         Check if Copilot CLI is available.
         
+        The probe result is cached for HEALTH_CHECK_TTL seconds.
+        
         Returns:
             True if CLI is available
         """
+        global _health_cache
+        checked_at, healthy = _health_cache
+        if time.monotonic() - checked_at < HEALTH_CHECK_TTL:
+            return healthy
+        
         try:
             process = await asyncio.create_subprocess_exec(
                 "copilot",
@@ -410,12 +588,32 @@ class CopilotCLIEngine:
                 stderr=asyncio.subprocess.PIPE
             )
             await asyncio.wait_for(process.wait(), timeout=5)
-            return process.returncode == 0
+            healthy = process.returncode == 0
         except (FileNotFoundError, asyncio.TimeoutError):
-            return False
+            healthy = False
         except Exception:
-            return False
+            healthy = False
+        
+        _health_cache = (time.monotonic(), healthy)
+        return healthy
+
+
+async def _decode_stream(stream: asyncio.StreamReader) -> AsyncIterator[str]:
+    """Read and decode a child's output as it arrives."""
+    # The incremental decoder keeps multi-byte characters split across
+    # chunk boundaries intact
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while chunk := await stream.read(STREAM_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
 
+def _invalidate_health_cache() -> None:
+    """Force the next health_check to probe the CLI again."""
+    global _health_cache
+    _health_cache = (float("-inf"), False)
 
-# Register with factory
-EngineFactory.register("copilot_cli", CopilotCLIEngine)
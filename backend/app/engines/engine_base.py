@@ -1,8 +1,11 @@
 """
 Base interface for AI engine adapters.
 """
-from typing import Protocol, Optional, Dict, Any, List, AsyncIterator
+import asyncio
+from typing import TYPE_CHECKING, Protocol, Optional, Dict, Any, List, AsyncIterator, Mapping, Tuple, Union
+from types import MappingProxyType
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -14,18 +17,25 @@ class EngineStatus(str, Enum):
     STOPPED = "stopped"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EngineMessage:
     """
     Represents a message in the engine conversation.
     """
     role: str  # 'user', 'assistant', 'system'
     content: str
-    timestamp: Optional[str] = None
+    timestamp: Optional[Union[int, str]] = None  # ns since epoch, or ISO string
     metadata: Optional[Dict[str, Any]] = None
+    
+    @property
+    def iso_timestamp(self) -> Optional[str]:
+        """Timestamp formatted as ISO 8601 (UTC for integer timestamps)."""
+        if isinstance(self.timestamp, int):
+            return datetime.fromtimestamp(self.timestamp / 1e9, tz=timezone.utc).isoformat()
+        return self.timestamp
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EngineResponse:
     """
     Response from an engine execution.
@@ -38,172 +48,275 @@ class EngineResponse:
     metadata: Optional[Dict[str, Any]] = None
 
 
-class EngineBase(Protocol):
-    """
-    Protocol defining the interface for AI engine adapters.
-    
-    Engine adapters provide a unified interface for interacting with
-    different AI assistants (GitHub Copilot CLI, Claude, GPT, etc.).
-    
-    Each engine must implement:
-    - Session management (start/stop)
-    - Command execution with streaming support
-    - Transcript capture and retrieval
-    """
-    
-    @property
-    def engine_name(self) -> str:
+if TYPE_CHECKING:
+    class EngineBase(Protocol):
         """
-        Name/identifier of the engine.
+        Protocol defining the interface for AI engine adapters.
         
-        Returns:
-            String identifier (e.g., 'copilot_cli', 'claude_api')
-        """
-        ...
-    
-    @property
-    def status(self) -> EngineStatus:
-        """
-        Current status of the engine session.
+        Engine adapters provide a unified interface for interacting with
+        different AI assistants (GitHub Copilot CLI, Claude, GPT, etc.).
         
-        Returns:
-            Current EngineStatus
+        Each engine must implement:
+        - Session management (start/stop)
+        - Command execution with streaming support
+        - Transcript capture and retrieval
         """
-        ...
-    
-    async def start_session(
-        self,
-        context: Optional[Dict[str, Any]] = None
-    ) -> EngineResponse:
-        """
-        Initialize a new engine session.
         
-        Args:
-            context: Optional context data (working directory, initial prompt, etc.)
+        @property
+        def engine_name(self) -> str:
+            """
+            Name/identifier of the engine.
             
-        Returns:
-            EngineResponse with session initialization result
+            Returns:
+                String identifier (e.g., 'copilot_cli', 'claude_api')
+            """
+            ...
+        
+        @property
+        def status(self) -> EngineStatus:
+            """
+            Current status of the engine session.
             
-        Raises:
-            RuntimeError: If session fails to start
-        """
-        ...
-    
-    async def execute(
-        self,
-        command: str,
-        stream: bool = False,
-        **kwargs
-    ) -> EngineResponse:
-        """
-        Execute a command/prompt with the engine.
+            Returns:
+                Current EngineStatus
+            """
+            ...
         
-        Args:
-            command: The command or prompt to execute
-            stream: Whether to stream the response
-            **kwargs: Additional engine-specific parameters
+        async def start_session(
+            self,
+            context: Optional[Dict[str, Any]] = None
+        ) -> EngineResponse:
+            """
+            Initialize a new engine session.
             
-        Returns:
-            EngineResponse with execution result
+            Args:
+                context: Optional context data (working directory, initial prompt, etc.)
+                
+            Returns:
+                EngineResponse with session initialization result
+                
+            Raises:
+                RuntimeError: If session fails to start
+            """
+            ...
+        
+        async def execute(
+            self,
+            command: str,
+            stream: bool = False,
+            **kwargs
+        ) -> EngineResponse:
+            """
+            Execute a command/prompt with the engine.
             
-        Raises:
-            RuntimeError: If execution fails
-        """
-        ...
-    
-    async def execute_stream(
-        self,
-        command: str,
-        **kwargs
-    ) -> AsyncIterator[str]:
-        """
-        Execute a command with streaming response.
+            Args:
+                command: The command or prompt to execute
+                stream: Whether to stream the response
+                **kwargs: Additional engine-specific parameters
+                
+            Returns:
+                EngineResponse with execution result
+                
+            Raises:
+                RuntimeError: If execution fails
+            """
+            ...
         
-        Args:
-            command: The command or prompt to execute
-            **kwargs: Additional engine-specific parameters
+        async def execute_stream(
+            self,
+            command: str,
+            **kwargs
+        ) -> AsyncIterator[str]:
+            """
+            Execute a command with streaming response.
             
-        Yields:
-            Chunks of the response as they arrive
+            Args:
+                command: The command or prompt to execute
+                **kwargs: Additional engine-specific parameters
+                
+            Yields:
+                Chunks of the response as they arrive
+                
+            Raises:
+                RuntimeError: If execution fails
+            """
+            ...
+        
+        async def stop_session(self) -> EngineResponse:
+            """
+            Terminate the current engine session.
             
-        Raises:
-            RuntimeError: If execution fails
-        """
-        ...
-    
-    async def stop_session(self) -> EngineResponse:
-        """
-        Terminate the current engine session.
+            Returns:
+                EngineResponse with session termination result
+            """
+            ...
         
-        Returns:
-            EngineResponse with session termination result
-        """
-        ...
-    
-    async def get_transcript(self) -> List[EngineMessage]:
-        """
-        Retrieve the full conversation transcript.
+        async def get_transcript(self) -> List[EngineMessage]:
+            """
+            Retrieve the full conversation transcript.
+            
+            Returns:
+                List of EngineMessage objects representing the conversation
+            """
+            ...
         
-        Returns:
-            List of EngineMessage objects representing the conversation
-        """
-        ...
-    
-    async def get_status(self) -> EngineStatus:
-        """
-        Get current engine status.
+        async def get_transcript_since(
+            self,
+            version: int
+        ) -> Tuple[List[EngineMessage], int]:
+            """
+            Retrieve messages added since a previously returned version.
+            
+            Args:
+                version: Version from the previous call, 0 for the first read
+                
+            Returns:
+                Tuple of new messages and the current version
+            """
+            ...
         
-        Returns:
-            Current EngineStatus
-        """
-        ...
-    
-    async def send_feedback(
-        self,
-        message_id: Optional[str],
-        feedback: str,
-        **kwargs
-    ) -> EngineResponse:
-        """
-        Send feedback or correction to the engine.
+        async def get_status(self) -> EngineStatus:
+            """
+            Get current engine status.
+            
+            Returns:
+                Current EngineStatus
+            """
+            ...
         
-        Args:
-            message_id: Optional ID of message to provide feedback on
-            feedback: Feedback content
-            **kwargs: Additional engine-specific parameters
+        async def send_feedback(
+            self,
+            message_id: Optional[str],
+            feedback: str,
+            **kwargs
+        ) -> EngineResponse:
+            """
+            Send feedback or correction to the engine.
             
-        Returns:
-            EngineResponse with feedback acknowledgment
-        """
-        ...
-    
-    async def health_check(self) -> bool:
+            Args:
+                message_id: Optional ID of message to provide feedback on
+                feedback: Feedback content
+                **kwargs: Additional engine-specific parameters
+                
+            Returns:
+                EngineResponse with feedback acknowledgment
+            """
+            ...
+        
+        async def health_check(self) -> bool:
+            """
+            Check if engine is available and healthy.
+            
+            Returns:
+                True if engine is available, False otherwise
+            """
+            ...
+else:
+    class EngineBase:
         """
-        Check if engine is available and healthy.
+        Runtime stand-in for the EngineBase protocol above.
         
-        Returns:
-            True if engine is available, False otherwise
+        The protocol is only needed by type checkers; adapters subclass
+        this empty base so no Protocol machinery runs at import or call time.
         """
-        ...
+        __slots__ = ()
+
+
+async def coalesce_chunks(
+    chunks: AsyncIterator[str],
+    max_delay: float = 0.010,
+    max_chars: int = 4096
+) -> AsyncIterator[str]:
+    """
+    Merge stream chunks that arrive close together into fewer, larger ones.
+    
+    A batch is emitted once it reaches max_chars or max_delay seconds after
+    its first chunk, so consumers wake once per batch rather than per chunk.
+    
+    Args:
+        chunks: Source stream
+        max_delay: Longest a chunk waits for others to join it, in seconds
+        max_chars: Batch size that is emitted without waiting
+        
+    Yields:
+        Concatenated chunks, in order
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    end = object()
+    
+    async def pump() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        finally:
+            await queue.put(end)
+    
+    reader = asyncio.create_task(pump())
+    try:
+        item = await queue.get()
+        while item is not end:
+            batch = [item]
+            size = len(item)
+            deadline = loop.time() + max_delay
+            item = None
+            while size < max_chars:
+                try:
+                    item = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    item = None
+                    break
+                if item is end:
+                    break
+                batch.append(item)
+                size += len(item)
+                item = None
+            yield "".join(batch)
+            if item is None:
+                item = await queue.get()
+        await reader  # Re-raise a failure of the source stream
+    finally:
+        reader.cancel()
 
 
 class EngineFactory:
     """
     Factory for creating engine instances.
+    
+    Engines hold per-session state, so each create() builds a new adapter.
     """
     
-    _engines: Dict[str, type] = {}
+    _engines: Mapping[str, type] = {}
     
     @classmethod
-    def register(cls, engine_name: str, engine_class: type) -> None:
+    def register(cls, engine_name: str, engine_class: Optional[type] = None):
         """
         Register an engine implementation.
         
+        Used as a class decorator, ``@EngineFactory.register("name")``,
+        or called directly with the class.
+        
         Args:
             engine_name: Name identifier for the engine
             engine_class: Class implementing EngineBase protocol
+            
+        Raises:
+            RuntimeError: If the registry has already been frozen
         """
-        cls._engines[engine_name] = engine_class
+        def decorator(engine_class: type) -> type:
+            if isinstance(cls._engines, MappingProxyType):
+                raise RuntimeError(f"Engine registry is frozen; cannot register '{engine_name}'")
+            cls._engines[engine_name] = engine_class
+            return engine_class
+        
+        if engine_class is not None:
+            return decorator(engine_class)
+        return decorator
+    
+    @classmethod
+    def freeze(cls) -> None:
+        """Make the registry read-only once all engines are imported"""
+        cls._engines = MappingProxyType(dict(cls._engines))
     
     @classmethod
     def create(cls, engine_name: str, **kwargs) -> EngineBase:
@@ -220,13 +333,14 @@ class EngineFactory:
         Raises:
             ValueError: If engine is not registered
         """
-        if engine_name not in cls._engines:
+        engine_class = cls._engines.get(engine_name)
+        if engine_class is None:
             raise ValueError(
                 f"Engine '{engine_name}' not registered. "
                 f"Available engines: {list(cls._engines.keys())}"
             )
         
-        return cls._engines[engine_name](**kwargs)
+        return engine_class(**kwargs)
     
     @classmethod
     def list_engines(cls) -> List[str]:
@@ -3,51 +3,131 @@ FastAPI application for change-driven-dev.
 UI-first, stack-agnostic engineering control system.
 """
 
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.api import projects_router, tasks_router, change_requests_router, artifacts_router
 from app.api.websocket import router as websocket_router
 from app.api.phase import router as phase_router
 from app.api.gates import router as gates_router
 from app.api.git import router as git_router
+from app.db.dao import request_cache
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the default project's pooled engine and warm caches before serving requests"""
+    from app.db.database import db_manager
+    try:
+        await db_manager.ensure_project_db(1)
+    except Exception:
+        # Still serve; get_db_session retries the init lazily on first use
+        logger.exception("Failed to open the default project database at startup")
+    app.state.db_manager = db_manager
+    # Builds and caches every route's pydantic JSON schema (mappers are
+    # already configured when app.models is imported)
+    app.openapi()
+    yield
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Change-Driven Development",
     description="UI-first, stack-agnostic engineering control system for AI-assisted development",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React dev servers
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Configure CORS for the dev servers. Explicit lists keep Starlette off its
+# wildcard path; same-origin deployments can set CORS_ENABLED=false.
+if os.getenv("CORS_ENABLED", "true").lower() == "true":
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React dev servers
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        allow_headers=["authorization", "content-type", "x-request-id"],
+    )
+
+
+
+class DAORequestCacheMiddleware:
+    """
+    Scope DAO lookup caching to a single HTTP request.
+    
+    Plain ASGI rather than @app.middleware("http"), which runs each request
+    in an extra task and re-streams the response body.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_cache():
+            await self.app(scope, receive, send)
+
+
+app.add_middleware(DAORequestCacheMiddleware)
+
+
+# Routers mounted on the app, in registration order
+ROUTERS = (
+    projects_router,
+    tasks_router,
+    change_requests_router,
+    artifacts_router,
+    phase_router,
+    gates_router,
+    git_router,
+    websocket_router,
 )
 
-# Include routers
-app.include_router(projects_router)
-app.include_router(tasks_router)
-app.include_router(change_requests_router)
-app.include_router(artifacts_router)
-app.include_router(phase_router)
-app.include_router(gates_router)
-app.include_router(git_router)
-app.include_router(websocket_router)
+for router in ROUTERS:
+    app.include_router(router)
+
 
+# Constant body, encoded once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "Change-Driven Development API",
+    "version": "0.1.0",
+    "docs": "/docs"
+})
 
-@app.get("/")
+
+@app.get("/", response_class=Response)
 async def root():
     """Root endpoint"""
-    return {
-        "message": "Change-Driven Development API",
-        "version": "0.1.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+HEALTH_TTL = 1.5  # seconds
+
+_health_cache: Tuple[float, Optional[dict]] = (float("-inf"), None)
+# asyncio.Lock binds to the running loop on first use (Python 3.10+)
+_health_lock = asyncio.Lock()
+
+
+def _check_database() -> None:
+    """Run a trivial query on a pooled connection of the default project"""
+    from app.db.database import db_manager
+    with db_manager.engine_for(1).connect() as conn:
+        conn.execute(text("SELECT 1"))
 
 
 @app.get("/health")
@@ -55,7 +135,26 @@ async def health():
     """
     Comprehensive health check endpoint.
     Checks status of core services and components.
+    
+    Results are cached for HEALTH_TTL seconds so probe storms do not
+    each hit the database; one request refreshes while others wait.
     """
+    global _health_cache
+    checked_at, health_status = _health_cache
+    if time.monotonic() - checked_at < HEALTH_TTL:
+        return health_status
+    
+    async with _health_lock:
+        checked_at, health_status = _health_cache
+        if time.monotonic() - checked_at < HEALTH_TTL:
+            return health_status
+        health_status = await _compute_health_status()
+        _health_cache = (time.monotonic(), health_status)
+    return health_status
+
+
+async def _compute_health_status() -> dict:
+    """Build the health payload, checking database connectivity"""
     health_status = {
         "status": "healthy",
         "version": "0.1.0",
@@ -76,12 +175,9 @@ async def health():
         }
     }
     
-    # Check database connectivity
+    # Check database connectivity off the event loop
     try:
-        from app.db import get_db
-        db = next(get_db(1))
-        db.execute(text("SELECT 1"))
-        db.close()
+        await asyncio.to_thread(_check_database)
     except Exception as e:
         health_status["services"]["database"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
@@ -91,4 +187,15 @@ async def health():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools ship with uvicorn[standard]; an import string
+    # is required for uvicorn to start more than one worker. One worker per
+    # core unless WEB_CONCURRENCY says otherwise (--reload dev runs use one)
+    workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=max(1, workers),
+    )
@@ -5,7 +5,9 @@ Core concepts: Tasks, ChangeRequests, Approvals, Phases
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Enum as SQLEnum, func
+from sqlalchemy import JSON, BigInteger, LargeBinary, String, Integer, DateTime, ForeignKey, Text, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import enum
 
@@ -15,6 +17,48 @@ class Base(DeclarativeBase):
     pass
 
 
+class EnumStr(TypeDecorator):
+    """
+    Python enum stored as a plain string column.
+    
+    Members are stored by name, as SQLAlchemy's Enum type did, so existing
+    rows read back unchanged. New enum values need no DDL.
+    """
+    impl = String(32)
+    cache_ok = True
+    
+    def __init__(self, enum_class: type[enum.Enum]):
+        super().__init__()
+        self.enum_class = enum_class
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_class):
+            # Accept values ("approved") as well as names ("APPROVED")
+            value = self.enum_class._value2member_map_.get(value) or self.enum_class[value]
+        return value.name
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else self.enum_class[value]
+
+
+class HexDigest(TypeDecorator):
+    """Hex digest string stored as raw bytes (half the width of the hex text)"""
+    impl = LargeBinary(32)
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else bytes.fromhex(value)
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else bytes(value).hex()
+
+
+# JSON payload columns: JSON text on SQLite, JSONB on PostgreSQL
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 class PhaseType(str, enum.Enum):
     """Phase types in the development workflow"""
     PLANNER = "planner"
@@ -23,6 +67,11 @@ class PhaseType(str, enum.Enum):
     CODER = "coder"
 
 
+# Workflow order, and each phase's successor (None after the last)
+PHASE_ORDER = tuple(PhaseType)
+NEXT_PHASE = {None: PHASE_ORDER[0], **dict(zip(PHASE_ORDER, PHASE_ORDER[1:] + (None,)))}
+
+
 class TaskStatus(str, enum.Enum):
     """Task status enumeration"""
     PENDING = "pending"
@@ -64,6 +113,11 @@ class RunStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses that end a run; str enums hash as their value, so plain
+# strings match too
+FINAL_RUN_STATUSES = frozenset({RunStatus.SUCCESS, RunStatus.FAILURE, RunStatus.TIMEOUT, RunStatus.CANCELLED})
+
+
 class Project(Base):
     """Project model - each project has its own SQLite database"""
     __tablename__ = "projects"
@@ -73,7 +127,7 @@ class Project(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     db_path: Mapped[str] = mapped_column(String(512), nullable=False)
     root_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
-    current_phase: Mapped[Optional[PhaseType]] = mapped_column(SQLEnum(PhaseType), nullable=True)
+    current_phase: Mapped[Optional[PhaseType]] = mapped_column(EnumStr(PhaseType), nullable=True)
     default_engine: Mapped[Optional[str]] = mapped_column(String(255), default="copilot_cli", nullable=True)
     spec_artifact_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     selected_arch_option_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -89,17 +143,25 @@ class Project(Base):
 class Task(Base):
     """Task model - versioned objects that flow through phases"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Matches list_tasks/get_next_approved_task filter + ORDER BY priority DESC, created_at
+        Index("ix_tasks_project_status_priority", "project_id", "status", text("priority DESC"), "created_at"),
+        # Same ordering for the list_tasks phase filter
+        Index("ix_tasks_project_phase_priority", "project_id", "current_phase", text("priority DESC"), "created_at"),
+        # No partial index over "active" statuses: every status filter is an
+        # equality match on one status, which the indexes above already serve
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    status: Mapped[TaskStatus] = mapped_column(SQLEnum(TaskStatus), default=TaskStatus.PENDING)
-    current_phase: Mapped[Optional[PhaseType]] = mapped_column(SQLEnum(PhaseType), nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(EnumStr(TaskStatus), default=TaskStatus.PENDING)
+    current_phase: Mapped[Optional[PhaseType]] = mapped_column(EnumStr(PhaseType), nullable=True)
     version: Mapped[int] = mapped_column(Integer, default=1)
     active_version_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     engine_override: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     priority: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
@@ -116,12 +178,16 @@ class Task(Base):
 class ChangeRequest(Base):
     """Change request model - versioned changes proposed for tasks"""
     __tablename__ = "change_requests"
+    __table_args__ = (
+        # list_change_requests filter + ORDER BY created_at DESC
+        Index("ix_change_requests_task_status_created", "task_id", "status", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(Integer, ForeignKey("tasks.id"), nullable=False)
-    phase: Mapped[PhaseType] = mapped_column(SQLEnum(PhaseType), nullable=False)
+    phase: Mapped[PhaseType] = mapped_column(EnumStr(PhaseType), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    status: Mapped[ChangeRequestStatus] = mapped_column(SQLEnum(ChangeRequestStatus), default=ChangeRequestStatus.DRAFT)
+    status: Mapped[ChangeRequestStatus] = mapped_column(EnumStr(ChangeRequestStatus), default=ChangeRequestStatus.DRAFT)
     version: Mapped[int] = mapped_column(Integer, default=1)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -134,6 +200,11 @@ class ChangeRequest(Base):
 class Approval(Base):
     """Approval model - tracks approvals/rejections for tasks and change requests"""
     __tablename__ = "approvals"
+    __table_args__ = (
+        # Keyset pagination in list_approvals: filter + ORDER BY id DESC
+        Index("ix_approvals_task_id_id", "task_id", text("id DESC")),
+        Index("ix_approvals_change_request_id_id", "change_request_id", text("id DESC")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -151,18 +222,25 @@ class Approval(Base):
 class Artifact(Base):
     """Artifact model - stores artifacts produced during development phases"""
     __tablename__ = "artifacts"
+    __table_args__ = (
+        # list_artifacts/iter_artifacts filters
+        Index("ix_artifacts_project_type", "project_id", "artifact_type"),
+        Index("ix_artifacts_task_id", "task_id"),
+        Index("ix_artifacts_run_id", "run_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.id"), nullable=False)
     task_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("tasks.id"), nullable=True)
     run_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("runs.id"), nullable=True)
-    artifact_type: Mapped[ArtifactType] = mapped_column(SQLEnum(ArtifactType), nullable=False)
+    artifact_type: Mapped[ArtifactType] = mapped_column(EnumStr(ArtifactType), nullable=False)
     name: Mapped[str] = mapped_column(String(512), nullable=False)
     file_path: Mapped[str] = mapped_column(String(1024), nullable=False)
     storage_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)  # Actual file location
-    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
-    file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # File size in bytes
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    sha256: Mapped[Optional[str]] = mapped_column(HexDigest, nullable=True)
+    blake3: Mapped[Optional[str]] = mapped_column(HexDigest, nullable=True)  # Also set when the blake3 extra is installed
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)  # File size in bytes
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     # Relationships
@@ -175,15 +253,19 @@ class Artifact(Base):
 class TaskVersion(Base):
     """TaskVersion model - versioned history of task changes"""
     __tablename__ = "task_versions"
+    __table_args__ = (
+        # list_task_versions/get_latest_task_version
+        Index("ix_task_versions_task_version", "task_id", "version_num"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(Integer, ForeignKey("tasks.id"), nullable=False)
     version_num: Mapped[int] = mapped_column(Integer, nullable=False)
     title: Mapped[str] = mapped_column(String(512), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    gates_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
-    deps_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON array of task IDs
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    gates_json: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)
+    deps_json: Mapped[Optional[list]] = mapped_column(JSONType, nullable=True)  # Task IDs
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
     # Relationships
@@ -193,14 +275,18 @@ class TaskVersion(Base):
 class Run(Base):
     """Run model - tracks execution runs for tasks"""
     __tablename__ = "runs"
+    __table_args__ = (
+        # list_runs/iter_runs filters
+        Index("ix_runs_task_status", "task_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(Integer, ForeignKey("tasks.id"), nullable=False)
     engine: Mapped[str] = mapped_column(String(255), nullable=False)
-    status: Mapped[RunStatus] = mapped_column(SQLEnum(RunStatus), default=RunStatus.RUNNING)
+    status: Mapped[RunStatus] = mapped_column(EnumStr(RunStatus), default=RunStatus.RUNNING)
     log_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
-    gate_results: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    gate_results: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     start_time: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     end_time: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
@@ -219,8 +305,13 @@ class ControlState(Base):
     max_attempts: Mapped[int] = mapped_column(Integer, default=3)
     timeout_seconds: Mapped[int] = mapped_column(Integer, default=300)
     current_task_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON
+    extra_data: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="control_state")
+
+
+# Resolve relationship() targets and back_populates now, at import, rather
+# than on the first query
+Base.registry.configure()
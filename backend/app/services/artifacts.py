@@ -1,14 +1,59 @@
 """
 Artifact storage service for managing files and their metadata.
 """
+import asyncio
+import contextlib
+import functools
 import hashlib
+import logging
+import mmap
+import operator
 import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional, BinaryIO
+from typing import Dict, Optional, BinaryIO
 
-from ..db.dao import create_artifact, get_artifact, delete_artifact
+try:
+    import blake3
+except ImportError:  # Optional dependency: pip install change-driven-dev[blake3]
+    blake3 = None
+
+from ..db.dao import create_artifact, get_artifact, transaction
 from ..models.models import ArtifactType
 
+logger = logging.getLogger(__name__)
+
+# Read/write size when copying artifact files into storage
+IO_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Keys of the artifact dicts returned by the storage service
+_ARTIFACT_KEYS = (
+    "id", "project_id", "task_id", "run_id", "artifact_type", "file_path", "storage_path",
+    "sha256", "blake3", "file_size", "extra_data", "created_at",
+)
+_ARTIFACT_FIELDS = operator.attrgetter(*_ARTIFACT_KEYS)
+
+
+def _artifact_to_dict(artifact) -> dict:
+    """Artifact row as a plain dict (enum value and ISO timestamp)"""
+    data = dict(zip(_ARTIFACT_KEYS, _ARTIFACT_FIELDS(artifact)))
+    data["artifact_type"] = data["artifact_type"].value
+    data["created_at"] = data["created_at"].isoformat()
+    return data
+
+
+def _select_sha256_factory():
+    """
+    Pick the SHA256 constructor used for artifact hashing.
+    
+    OpenSSL's implementation dispatches to SHA-NI / ARMv8 crypto instructions
+    when the CPU has them; CPython's bundled fallback does not.
+    """
+    if hashlib.sha256.__module__ != "_hashlib":
+        logger.warning("Python is built without OpenSSL hashlib; artifact hashing will not use SHA CPU extensions")
+    return functools.partial(hashlib.new, "sha256", usedforsecurity=False)
+
 
 class ArtifactStorageService:
     """
@@ -16,6 +61,10 @@ class ArtifactStorageService:
     Stores artifacts in a project-specific directory structure.
     """
 
+    _hasher_factory = staticmethod(_select_sha256_factory())
+    # Digests recorded next to sha256 (always set) for newly stored files
+    EXTRA_DIGESTS = ("blake3",) if blake3 is not None else ()
+
     def __init__(self, base_storage_path: str = "./artifacts"):
         """
         Initialize artifact storage service.
@@ -24,7 +73,15 @@ class ArtifactStorageService:
             base_storage_path: Base directory for all artifact storage
         """
         self.base_storage_path = Path(base_storage_path)
-        self.base_storage_path.mkdir(parents=True, exist_ok=True)
+        # Directories already created, so repeat lookups skip the mkdir syscalls
+        self._ensured_dirs: set[Path] = set()
+        self._ensure_dir(self.base_storage_path)
+
+    def _ensure_dir(self, path: Path) -> None:
+        """Create a directory (and parents) once per service instance"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
 
     def get_project_storage_path(self, project_id: int) -> Path:
         """
@@ -37,7 +94,7 @@ class ArtifactStorageService:
             Path to project's artifact directory
         """
         project_path = self.base_storage_path / f"project_{project_id}"
-        project_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(project_path)
         return project_path
 
     def get_artifact_path(self, project_id: int, artifact_id: int, filename: str) -> Path:
@@ -55,9 +112,84 @@ class ArtifactStorageService:
         project_path = self.get_project_storage_path(project_id)
         # Use artifact_id as subdirectory to avoid filename conflicts
         artifact_path = project_path / f"artifact_{artifact_id}"
-        artifact_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(artifact_path)
         return artifact_path / filename
 
+    def _write_object(self, file_obj: BinaryIO) -> tuple[Path, Dict[str, str], int]:
+        """
+        Write file contents into the content-addressable object store.
+        
+        The data is hashed while it is written to a temporary file, which is
+        then renamed to objects/<sha256[:2]>/<sha256[2:]>; if that object
+        already exists the temporary copy is dropped instead.
+        
+        Args:
+            file_obj: File object positioned at the start of the data
+            
+        Returns:
+            Tuple of (object path, hex digests by algorithm, size in bytes)
+        """
+        objects_path = self.base_storage_path / "objects"
+        self._ensure_dir(objects_path)
+        hashers = {
+            algo: self._digest_factory(algo)()
+            for algo in ("sha256", *self.EXTRA_DIGESTS)
+        }
+        updates = [hasher.update for hasher in hashers.values()]
+        file_size = 0
+        
+        fd, tmp_name = tempfile.mkstemp(dir=objects_path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while chunk := file_obj.read(IO_CHUNK_SIZE):
+                    for update in updates:
+                        update(chunk)
+                    f.write(chunk)
+                    file_size += len(chunk)
+            
+            digests = {algo: hasher.hexdigest() for algo, hasher in hashers.items()}
+            blob_path = self._object_path(digests["sha256"])
+            if blob_path.exists():
+                os.unlink(tmp_name)  # Same content already stored
+            else:
+                self._ensure_dir(blob_path.parent)
+                os.replace(tmp_name, blob_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_name)
+            raise
+        
+        return blob_path, digests, file_size
+
+    def _object_path(self, sha256: str) -> Path:
+        """Location of the stored object with the given SHA256 digest"""
+        return self.base_storage_path / "objects" / sha256[:2] / sha256[2:]
+
+    def _release_object(self, sha256: str) -> None:
+        """Delete the object for sha256 once no artifact links to it"""
+        blob_path = self._object_path(sha256)
+        try:
+            if blob_path.stat().st_nlink <= 1:
+                blob_path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass  # Stored before the object store existed, or already released
+
+    def prune_objects(self) -> int:
+        """
+        Delete stored objects no artifact links to any more.
+        
+        Returns:
+            Number of objects deleted
+        """
+        objects_path = self.base_storage_path / "objects"
+        pruned = 0
+        for blob_path in objects_path.glob("??/*"):
+            # Only the object itself is left once every artifact link is gone
+            if blob_path.stat().st_nlink <= 1:
+                blob_path.unlink(missing_ok=True)
+                pruned += 1
+        return pruned
+
     def compute_sha256(self, file_obj: BinaryIO) -> str:
         """
         Compute SHA256 hash of file contents.
@@ -68,11 +200,30 @@ class ArtifactStorageService:
         Returns:
             Hexadecimal SHA256 hash string
         """
-        sha256_hash = hashlib.sha256()
-        # Read in chunks to handle large files
-        for chunk in iter(lambda: file_obj.read(4096), b""):
-            sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+        # Reads in large chunks inside C with the GIL released
+        return hashlib.file_digest(file_obj, self._hasher_factory).hexdigest()
+
+    def compute_digest(self, file_obj: BinaryIO, algo: Optional[str] = None) -> str:
+        """
+        Compute a digest of file contents.
+        
+        Args:
+            file_obj: File object to hash
+            algo: 'sha256' (default) or 'blake3'
+            
+        Returns:
+            Hexadecimal digest string
+        """
+        return hashlib.file_digest(file_obj, self._digest_factory(algo)).hexdigest()
+
+    def _digest_factory(self, algo: Optional[str] = None):
+        """Return a constructor for hashers of the given algorithm (defaults to sha256)"""
+        algo = algo or "sha256"
+        if algo == "sha256":
+            return self._hasher_factory
+        if algo == "blake3" and blake3 is not None:
+            return functools.partial(blake3.blake3, max_threads=blake3.blake3.AUTO)
+        raise ValueError(f"Unsupported digest algorithm: {algo}")
 
     def store_artifact(
         self,
@@ -101,63 +252,61 @@ class ArtifactStorageService:
         Returns:
             Created artifact record as dict
         """
-        # Compute hash first
-        file_obj.seek(0)
-        sha256_hash = self.compute_sha256(file_obj)
-        
         # Get filename for storage
         filename = Path(file_path).name
         
-        # Create initial artifact record with placeholder ID
-        # We'll use a temporary approach: create with file_path, then update storage_path
-        temp_artifact = create_artifact(
-            db=session,
-            project_id=project_id,
-            artifact_type=ArtifactType(artifact_type),
-            name=filename,
-            file_path=file_path,
-            task_id=task_id,
-            run_id=run_id,
-            sha256=sha256_hash,
-            extra_data=str(extra_data or {})
-        )
-        
-        try:
-            # Store file using the artifact ID
-            file_obj.seek(0)
-            storage_path = self.get_artifact_path(project_id, temp_artifact.id, filename)
-            
-            with open(storage_path, 'wb') as f:
-                for chunk in iter(lambda: file_obj.read(4096), b""):
-                    f.write(chunk)
+        # Create the artifact record first (flushed, not committed) to get its ID,
+        # then fill in storage_path, digest and size once the file has been
+        # written; the whole record is committed once, or rolled back on failure
+        with transaction(session):
+            temp_artifact = create_artifact(
+                db=session,
+                project_id=project_id,
+                artifact_type=ArtifactType(artifact_type),
+                name=filename,
+                file_path=file_path,
+                task_id=task_id,
+                run_id=run_id,
+                extra_data=extra_data or {}
+            )
             
-            file_size = storage_path.stat().st_size
+            try:
+                # Store the content once by digest, then link it under the artifact ID
+                file_obj.seek(0)
+                storage_path = self.get_artifact_path(project_id, temp_artifact.id, filename)
+                blob_path, digests, file_size = self._write_object(file_obj)
+                try:
+                    os.link(blob_path, storage_path)
+                except FileNotFoundError:
+                    # Released as unreferenced between the write and the link: store it again
+                    file_obj.seek(0)
+                    blob_path, digests, file_size = self._write_object(file_obj)
+                    os.link(blob_path, storage_path)
+                except OSError:
+                    shutil.copyfile(blob_path, storage_path)  # No hard links on this filesystem
+            except Exception as e:
+                raise RuntimeError(f"Failed to store artifact file: {str(e)}") from e
             
-            # Update the artifact record with storage info
             # Direct update since no update_artifact function exists
             temp_artifact.storage_path = str(storage_path)
             temp_artifact.file_size = file_size
-            session.commit()
-            session.refresh(temp_artifact)
-            
-            return {
-                "id": temp_artifact.id,
-                "project_id": temp_artifact.project_id,
-                "task_id": temp_artifact.task_id,
-                "run_id": temp_artifact.run_id,
-                "artifact_type": temp_artifact.artifact_type.value,
-                "file_path": temp_artifact.file_path,
-                "storage_path": temp_artifact.storage_path,
-                "sha256": temp_artifact.sha256,
-                "file_size": temp_artifact.file_size,
-                "extra_data": temp_artifact.extra_data,
-                "created_at": temp_artifact.created_at.isoformat()
-            }
-            
-        except Exception as e:
-            # Clean up artifact record if file storage fails
-            delete_artifact(session, temp_artifact.id)
-            raise RuntimeError(f"Failed to store artifact file: {str(e)}") from e
+            for algo, digest in digests.items():
+                setattr(temp_artifact, algo, digest)
+        
+        return _artifact_to_dict(temp_artifact)
+
+    async def store_artifact_async(self, *args, **kwargs) -> dict:
+        """
+        Run store_artifact in a worker thread so hashing and file I/O don't block the event loop.
+        
+        Takes the same arguments as store_artifact; the session is only used
+        from that thread until the call returns.
+        """
+        return await asyncio.to_thread(self.store_artifact, *args, **kwargs)
+
+    async def verify_artifact_async(self, *args, **kwargs) -> bool:
+        """Run verify_artifact in a worker thread (same arguments)"""
+        return await asyncio.to_thread(self.verify_artifact, *args, **kwargs)
 
     def retrieve_artifact(self, session, artifact_id: int) -> tuple[dict, Path]:
         """
@@ -181,45 +330,49 @@ class ArtifactStorageService:
             raise ValueError(f"Artifact {artifact_id} has no storage path")
         
         storage_path = Path(artifact.storage_path)
-        if not storage_path.exists():
-            raise FileNotFoundError(f"Artifact file not found: {storage_path}")
+        try:
+            st = storage_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Artifact file not found: {storage_path}") from None
         
-        artifact_dict = {
-            "id": artifact.id,
-            "project_id": artifact.project_id,
-            "task_id": artifact.task_id,
-            "run_id": artifact.run_id,
-            "artifact_type": artifact.artifact_type.value,
-            "file_path": artifact.file_path,
-            "storage_path": artifact.storage_path,
-            "sha256": artifact.sha256,
-            "file_size": artifact.file_size,
-            "extra_data": artifact.extra_data,
-            "created_at": artifact.created_at.isoformat()
-        }
+        artifact_dict = _artifact_to_dict(artifact)
+        if artifact_dict["file_size"] is None:
+            artifact_dict["file_size"] = st.st_size
         
         return artifact_dict, storage_path
 
-    def verify_artifact(self, file_path: Path, expected_sha256: str) -> bool:
+    def verify_artifact(self, file_path: Path, expected_digest: str, algo: str = "sha256") -> bool:
         """
-        Verify artifact file integrity by comparing SHA256 hash.
+        Verify artifact file integrity by comparing its digest.
         
         Args:
             file_path: Path to artifact file
-            expected_sha256: Expected SHA256 hash
+            expected_digest: Expected hex digest
+            algo: Algorithm the digest was recorded with ('sha256' or 'blake3')
             
         Returns:
             True if hash matches, False otherwise
         """
-        if not file_path.exists():
+        try:
+            with open(file_path, 'rb') as f:
+                hasher = self._digest_factory(algo)()
+                if os.fstat(f.fileno()).st_size:  # Empty files cannot be mapped
+                    # The hasher consumes the whole mapping in one call, with the GIL released
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+                actual_digest = hasher.hexdigest()
+        except FileNotFoundError:
             return False
         
-        with open(file_path, 'rb') as f:
-            actual_sha256 = self.compute_sha256(f)
-        
-        return actual_sha256 == expected_sha256
+        return actual_digest == expected_digest
 
-    def delete_artifact_file(self, project_id: int, artifact_id: int, filename: str) -> bool:
+    def delete_artifact_file(
+        self,
+        project_id: int,
+        artifact_id: int,
+        filename: str,
+        sha256: Optional[str] = None
+    ) -> bool:
         """
         Delete artifact file from storage.
         
@@ -227,22 +380,28 @@ class ArtifactStorageService:
             project_id: ID of the project
             artifact_id: ID of the artifact
             filename: Name of the file
+            sha256: Recorded digest; its stored object is deleted with the last link
             
         Returns:
             True if file was deleted, False if file didn't exist
         """
         artifact_path = self.get_artifact_path(project_id, artifact_id, filename)
         
-        if artifact_path.exists():
+        try:
             artifact_path.unlink()
-            # Try to remove parent directory if empty
-            try:
-                artifact_path.parent.rmdir()
-            except OSError:
-                pass  # Directory not empty or other error
-            return True
+        except FileNotFoundError:
+            return False
+        
+        if sha256:
+            self._release_object(sha256)
         
-        return False
+        # Try to remove parent directory if empty
+        try:
+            artifact_path.parent.rmdir()
+            self._ensured_dirs.discard(artifact_path.parent)
+        except OSError:
+            pass  # Directory not empty or other error
+        return True
 
     def cleanup_project_artifacts(self, project_id: int) -> int:
         """
@@ -254,24 +413,37 @@ class ArtifactStorageService:
         Returns:
             Number of files deleted
         """
-        project_path = self.get_project_storage_path(project_id)
-        deleted_count = 0
+        # Not get_project_storage_path(): that would create the directory
+        project_path = self.base_storage_path / f"project_{project_id}"
+        deleted_count = _count_files(project_path)
         
-        if project_path.exists():
-            for item in project_path.rglob('*'):
-                if item.is_file():
-                    item.unlink()
-                    deleted_count += 1
-            
-            # Remove the project directory
-            try:
-                import shutil
-                shutil.rmtree(project_path)
-            except OSError:
-                pass  # Directory not empty or other error
+        # A single tree walk removes files and directories alike
+        shutil.rmtree(project_path, ignore_errors=True)
+        self._ensured_dirs = {
+            path for path in self._ensured_dirs if not path.is_relative_to(project_path)
+        }
+        self.prune_objects()
         
         return deleted_count
 
 
+def _count_files(root: Path) -> int:
+    """Count regular files under root with os.scandir (0 if root is missing)"""
+    count = 0
+    pending = [root]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    count += 1
+    return count
+
+
 # Global instance
 artifact_storage = ArtifactStorageService()
@@ -3,11 +3,24 @@ Git integration service for version control operations.
 Handles repository initialization, commits, status tracking, and diffs.
 """
 import asyncio
+import re
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
 
+try:
+    import pygit2
+except ImportError:  # Optional dependency: pip install change-driven-dev[git]
+    pygit2 = None
+
+# Porcelain XY codes that put a path in the staged / unstaged lists
+_STAGED_CODES = frozenset('MADRC')
+_UNSTAGED_CODES = frozenset('MD')
+
+# "--shortstat" summary line, e.g. " 3 files changed, 10 insertions(+)"
+_FILES_CHANGED_RE = re.compile(r'(\d+) files? changed')
+
 
 class GitStatus(BaseModel):
     """Git repository status."""
@@ -44,21 +57,36 @@ class GitService:
             repo_path: Path to git repository root
         """
         self.repo_path = Path(repo_path).resolve()
+        self._is_repo_cache: Optional[bool] = None
+        self._repo = None  # pygit2.Repository, opened on first read
+    
+    def _open_repo(self):
+        """Open the repository in-process with pygit2 (None if unavailable or not a repo)"""
+        if pygit2 is None:
+            return None
+        if self._repo is None:
+            git_dir = pygit2.discover_repository(str(self.repo_path))
+            if git_dir is None:
+                return None
+            self._repo = pygit2.Repository(git_dir)
+        return self._repo
     
     async def _run_git_command(
         self,
         args: List[str],
-        check: bool = True
-    ) -> tuple[int, str, str]:
+        check: bool = True,
+        decode: bool = True
+    ) -> tuple[int, Union[str, bytes], str]:
         """
         Run a git command.
         
         Args:
             args: Git command arguments (without 'git' prefix)
             check: Whether to raise exception on non-zero exit code
+            decode: If False, return stdout as raw bytes
             
         Returns:
-            Tuple of (exit_code, stdout, stderr)
+            Tuple of (exit_code, stdout, stderr); undecodable bytes are replaced
             
         Raises:
             RuntimeError: If command fails and check=True
@@ -75,8 +103,11 @@ class GitService:
         stdout, stderr = await proc.communicate()
         exit_code = proc.returncode if proc.returncode is not None else -1
         
-        stdout_str = stdout.decode() if stdout else ""
-        stderr_str = stderr.decode() if stderr else ""
+        if decode:
+            stdout_str = stdout.decode('utf-8', errors='replace') if stdout else ""
+        else:
+            stdout_str = stdout or b""
+        stderr_str = stderr.decode('utf-8', errors='replace') if stderr else ""
         
         if check and exit_code != 0:
             raise RuntimeError(
@@ -94,11 +125,15 @@ class GitService:
         Returns:
             True if directory is a git repo, False otherwise
         """
-        exit_code, _, _ = await self._run_git_command(
-            ["rev-parse", "--git-dir"],
-            check=False
-        )
-        return exit_code == 0
+        if self._is_repo_cache is None and pygit2 is not None:
+            self._is_repo_cache = pygit2.discover_repository(str(self.repo_path)) is not None
+        if self._is_repo_cache is None:
+            exit_code, _, _ = await self._run_git_command(
+                ["rev-parse", "--git-dir"],
+                check=False
+            )
+            self._is_repo_cache = exit_code == 0
+        return self._is_repo_cache
     
     async def init(self, initial_branch: str = "main") -> None:
         """
@@ -114,6 +149,8 @@ class GitService:
             return  # Already initialized
         
         await self._run_git_command(["init", "-b", initial_branch])
+        self._is_repo_cache = None
+        self._repo = None
     
     async def get_status(self) -> GitStatus:
         """
@@ -122,65 +159,84 @@ class GitService:
         Returns:
             GitStatus object with current repository state
         """
-        if not await self.is_repo():
-            return GitStatus(
-                is_repo=False,
-                branch="",
-                has_changes=False,
-                staged_files=[],
-                unstaged_files=[],
-                untracked_files=[]
-            )
-        
-        # Get current branch
-        _, branch, _ = await self._run_git_command(
-            ["rev-parse", "--abbrev-ref", "HEAD"]
-        )
-        branch = branch.strip()
-        
-        # Get status in porcelain format
-        _, status_output, _ = await self._run_git_command(
-            ["status", "--porcelain"]
+        # One process reports branch, upstream counts and files together
+        exit_code, status_output, stderr = await self._run_git_command(
+            ["status", "--porcelain=v2", "--branch", "--ahead-behind"],
+            check=False
         )
+        if exit_code != 0:
+            if not await self.is_repo():
+                return GitStatus(
+                    is_repo=False,
+                    branch="",
+                    has_changes=False,
+                    staged_files=[],
+                    unstaged_files=[],
+                    untracked_files=[]
+                )
+            raise RuntimeError(
+                f"Git command failed: git status --porcelain=v2\n"
+                f"Exit code: {exit_code}\n"
+                f"stderr: {stderr}"
+            )
+        self._is_repo_cache = True
         
+        branch = ""
+        ahead = 0
+        behind = 0
         staged_files = []
         unstaged_files = []
         untracked_files = []
+        # Bound appends skip an attribute lookup per line on large statuses
+        staged_append = staged_files.append
+        unstaged_append = unstaged_files.append
+        untracked_append = untracked_files.append
         
-        for line in status_output.strip().split('\n'):
+        for line in status_output.splitlines():
             if not line:
                 continue
             
-            status_code = line[:2]
-            filename = line[3:]
+            kind = line[0]
+            
+            # Header lines: "# branch.head <name>", "# branch.ab +<ahead> -<behind>"
+            if kind == '#':
+                if line.startswith('# branch.head '):
+                    branch = line[14:]
+                    if branch == '(detached)':
+                        branch = 'HEAD'  # Same as rev-parse --abbrev-ref HEAD
+                elif line.startswith('# branch.ab '):
+                    parts = line[12:].split()
+                    if len(parts) == 2:
+                        ahead = int(parts[0])
+                        behind = -int(parts[1])
+                continue
+            
+            # Untracked files
+            if kind == '?':
+                untracked_append(line[2:])
+                continue
+            
+            # Ordinary ("1 XY sub mH mI mW hH hI path") and renamed/copied
+            # ("2 XY sub mH mI mW hH hI Xscore path<TAB>orig") entries
+            if kind == '1':
+                filename = line.split(' ', 8)[8]
+            elif kind == '2':
+                filename = line.split(' ', 9)[9].split('\t', 1)[0]
+            else:
+                continue  # Unmerged and ignored entries
+            
+            status_code = line[2:4]
             
             # Staged changes
-            if status_code[0] in ('M', 'A', 'D', 'R', 'C'):
-                staged_files.append(filename)
+            if status_code[0] in _STAGED_CODES:
+                staged_append(filename)
             
             # Unstaged changes
-            if status_code[1] in ('M', 'D'):
-                unstaged_files.append(filename)
-            
-            # Untracked files
-            if status_code == '??':
-                untracked_files.append(filename)
+            if status_code[1] in _UNSTAGED_CODES:
+                unstaged_append(filename)
         
         has_changes = bool(staged_files or unstaged_files or untracked_files)
         
-        # Get ahead/behind counts (if remote exists)
-        ahead = 0
-        behind = 0
-        exit_code, upstream_output, _ = await self._run_git_command(
-            ["rev-list", "--left-right", "--count", f"{branch}...@{{u}}"],
-            check=False
-        )
-        if exit_code == 0 and upstream_output.strip():
-            parts = upstream_output.strip().split()
-            if len(parts) == 2:
-                ahead = int(parts[0])
-                behind = int(parts[1])
-        
         return GitStatus(
             is_repo=True,
             branch=branch,
@@ -264,17 +320,19 @@ class GitService:
     async def get_diff(
         self,
         cached: bool = False,
-        files: Optional[List[str]] = None
-    ) -> str:
+        files: Optional[List[str]] = None,
+        raw: bool = False
+    ) -> Union[str, bytes]:
         """
         Get diff of changes.
         
         Args:
             cached: If True, get staged changes; if False, get unstaged
             files: Optional list of specific files to diff
+            raw: If True, return the undecoded diff bytes
             
         Returns:
-            Diff output as string
+            Diff output as string (bytes when raw=True)
         """
         args = ["diff"]
         
@@ -285,7 +343,7 @@ class GitService:
             args.append("--")
             args.extend(files)
         
-        _, diff_output, _ = await self._run_git_command(args)
+        _, diff_output, _ = await self._run_git_command(args, decode=not raw)
         return diff_output
     
     async def get_last_commit(self) -> Optional[GitCommitInfo]:
@@ -295,26 +353,27 @@ class GitService:
         Returns:
             GitCommitInfo or None if no commits exist
         """
+        if pygit2 is not None:
+            return await asyncio.to_thread(self._read_last_commit)
+        
+        # The header line is followed by the --shortstat summary in the same call
         exit_code, output, _ = await self._run_git_command(
-            ["log", "-1", "--pretty=format:%H|%s|%an|%aI|%ct"],
+            ["log", "-1", "--pretty=format:%H|%s|%an|%aI|%ct", "--shortstat"],
             check=False
         )
         
         if exit_code != 0 or not output.strip():
             return None
         
-        parts = output.strip().split('|')
+        header, _, stats = output.strip().partition('\n')
+        parts = header.split('|')
         if len(parts) != 5:
             return None
         
         sha, message, author, iso_date, commit_time = parts
         
-        # Get number of files changed
-        _, stats, _ = await self._run_git_command(
-            ["show", "--stat", "--oneline", sha],
-            check=False
-        )
-        files_changed = len([l for l in stats.split('\n') if '|' in l])
+        match = _FILES_CHANGED_RE.search(stats)
+        files_changed = int(match.group(1)) if match else 0
         
         return GitCommitInfo(
             sha=sha,
@@ -324,6 +383,30 @@ class GitService:
             files_changed=files_changed
         )
     
+    def _read_last_commit(self) -> Optional[GitCommitInfo]:
+        """get_last_commit through pygit2: reads HEAD without spawning git"""
+        repo = self._open_repo()
+        if repo is None or repo.head_is_unborn:
+            return None
+        
+        commit = repo.head.peel(pygit2.Commit)
+        if commit.parents:
+            diff = repo.diff(commit.parents[0], commit)
+        else:
+            diff = commit.tree.diff_to_tree(swap=True)
+        
+        author = commit.author
+        return GitCommitInfo(
+            sha=str(commit.id),
+            # Same as %s: the first paragraph joined onto one line
+            message=commit.message.split("\n\n", 1)[0].strip().replace("\n", " "),
+            author=author.name,
+            timestamp=datetime.fromtimestamp(
+                author.time, timezone(timedelta(minutes=author.offset))
+            ),
+            files_changed=len(diff)
+        )
+    
     async def create_task_commit(
         self,
         task_id: int,
@@ -376,16 +459,13 @@ class GitService:
         Returns:
             Formatted commit message
         """
-        # Main commit line
-        message = f"[Task {task_id}] {task_title}\n\n"
-        
-        # Add phase info
-        message += f"Phase: {phase}\n"
+        # Main commit line, blank line, phase info
+        lines = [f"[Task {task_id}] {task_title}", "", f"Phase: {phase}"]
         
         # Add gate results if available
         if gate_results:
             summary = gate_results.get("summary", {})
-            message += f"Gates: {summary.get('passed', 0)}/{summary.get('total', 0)} passed\n"
+            lines.append(f"Gates: {summary.get('passed', 0)}/{summary.get('total', 0)} passed")
             
             # Add failed gates if any
             failed_gates = [
@@ -394,12 +474,12 @@ class GitService:
                 if not r.get("passed", False)
             ]
             if failed_gates:
-                message += f"Failed: {', '.join(failed_gates)}\n"
+                lines.append(f"Failed: {', '.join(failed_gates)}")
         
         # Add automation footer
-        message += "\nAutomated commit by change-driven-dev"
+        lines += ("", "Automated commit by change-driven-dev")
         
-        return message
+        return "\n".join(lines)
     
     async def has_uncommitted_changes(self) -> bool:
         """
@@ -2,11 +2,16 @@
 Orchestration service for managing phase transitions and AI engine runs.
 Coordinates planner, architect, and coder phases.
 """
+import copy
 import json
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+import orjson
+
 from sqlalchemy.orm import Session
 
 from ..db import dao, get_db
@@ -17,6 +22,43 @@ from ..core.logging_config import RunLogger
 from ..services.artifacts import artifact_storage
 
 
+_PROMPTS_DIR = Path(__file__).parent.parent.parent.parent / "PROMPTS"
+
+
+@lru_cache(maxsize=None)
+def _load_prompt_template(name: str) -> Optional[str]:
+    """Read PROMPTS/<name>.md once per process (None if missing); cache_clear() to reload"""
+    try:
+        return (_PROMPTS_DIR / f"{name}.md").read_text()
+    except FileNotFoundError:
+        return None
+
+
+# Fenced code blocks in engine output; an unterminated fence runs to the end
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)(?:```|\Z)", re.DOTALL)
+_ANY_FENCE_RE = re.compile(r"```[\w+-]*\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+
+@lru_cache(maxsize=128)
+def _parse_plan_json(response_content: str) -> Any:
+    """
+    Extract and parse the plan JSON from an engine response.
+    
+    Cached by response text, so retries that return the same output skip the
+    scan and the parse. Raises json.JSONDecodeError (not cached) on bad JSON.
+    """
+    # A bare JSON response parses directly
+    try:
+        return json.loads(response_content)
+    except json.JSONDecodeError:
+        pass
+    
+    # Otherwise prefer a ```json block, then any code block, then the whole content
+    match = _JSON_FENCE_RE.search(response_content) or _ANY_FENCE_RE.search(response_content)
+    json_str = match.group(1) if match else response_content
+    return json.loads(json_str.strip())
+
+
 class OrchestrationService:
     """
     Service for orchestrating AI-driven development phases.
@@ -129,11 +171,8 @@ class OrchestrationService:
             
             # Execute planner
             # Read planner prompt template
-            planner_prompt_path = Path(__file__).parent.parent.parent.parent / "PROMPTS" / "planner.md"
-            if planner_prompt_path.exists():
-                with open(planner_prompt_path, 'r') as f:
-                    planner_template = f.read()
-                
+            planner_template = _load_prompt_template("planner")
+            if planner_template is not None:
                 # Build full prompt
                 full_prompt = f"{planner_template}\n\n## Project Specification\n\n{spec_content}\n\nPlease analyze this specification and produce a plan.json file with task breakdown."
             else:
@@ -275,22 +314,9 @@ class OrchestrationService:
                 "raw_response": response_content
             }
         
-        # Try to find JSON code block
-        if "```json" in response_content:
-            start = response_content.find("```json") + 7
-            end = response_content.find("```", start)
-            json_str = response_content[start:end].strip()
-        elif "```" in response_content:
-            # Try any code block
-            start = response_content.find("```") + 3
-            end = response_content.find("```", start)
-            json_str = response_content[start:end].strip()
-        else:
-            # Try the whole content
-            json_str = response_content.strip()
-        
         try:
-            plan_data = json.loads(json_str)
+            # Callers may modify the plan, so never hand out the cached object
+            plan_data = copy.deepcopy(_parse_plan_json(response_content))
             return plan_data
         except json.JSONDecodeError as e:
             # Fallback: create basic structure with error details
@@ -353,18 +379,19 @@ class OrchestrationService:
                 {
                     "role": msg.role,
                     "content": msg.content,
-                    "timestamp": msg.timestamp,
+                    "timestamp": msg.iso_timestamp,
                     "metadata": msg.metadata
                 }
                 for msg in transcript
             ]
         }
         
-        transcript_json = json.dumps(transcript_data, indent=2)
+        # orjson encodes straight to UTF-8 bytes, without a str round trip
+        transcript_json = orjson.dumps(transcript_data, option=orjson.OPT_INDENT_2)
         
         # Store file (this creates the artifact AND stores the file)
         import io
-        file_obj = io.BytesIO(transcript_json.encode('utf-8'))
+        file_obj = io.BytesIO(transcript_json)
         
         artifact_dict = artifact_storage.store_artifact(
             session=db,
@@ -510,11 +537,8 @@ class OrchestrationService:
             run_logger.info("Engine session started, executing architect")
             
             # Read architect prompt template
-            architect_prompt_path = Path(__file__).parent.parent.parent.parent / "PROMPTS" / "architect.md"
-            if architect_prompt_path.exists():
-                with open(architect_prompt_path, 'r') as f:
-                    architect_template = f.read()
-                
+            architect_template = _load_prompt_template("architect")
+            if architect_template is not None:
                 # Build full prompt
                 full_prompt = f"""{architect_template}
 
@@ -856,11 +880,8 @@ Provide 2-3 architecture options with trade-offs."""
             run_logger.info("Engine session started, executing coder")
             
             # Read coder prompt template
-            coder_prompt_path = Path(__file__).parent.parent.parent.parent / "PROMPTS" / "coder.md"
-            if coder_prompt_path.exists():
-                with open(coder_prompt_path, 'r') as f:
-                    coder_template = f.read()
-                
+            coder_template = _load_prompt_template("coder")
+            if coder_template is not None:
                 # Build full prompt
                 full_prompt = f"""{coder_template}
 
@@ -1125,9 +1146,8 @@ Implement the changes needed to complete this task."""
             }
         
         try:
-            gates_data = json.loads(latest_version.gates_json)
-            gate_specs = [GateSpec(**g) for g in gates_data]
-        except (json.JSONDecodeError, ValueError):
+            gate_specs = [GateSpec(**g) for g in latest_version.gates_json]
+        except (TypeError, ValueError):
             return {
                 "all_passed": False,
                 "results": [],
@@ -1165,7 +1185,7 @@ Implement the changes needed to complete this task."""
         
         return {
             "all_passed": summary["all_passed"],
-            "results": [r.dict() for r in results],
+            "results": [r.to_dict() for r in results],
             "summary": summary
         }
 
@@ -326,8 +326,7 @@ class TestArtifactsAPI:
         """Test creating an artifact with extra data"""
         project = client.post("/api/projects/", json={"name": "Test Project"}).json()
         
-        import json
-        extra_data = json.dumps({"key1": "value1", "key2": "value2"})
+        extra_data = {"key1": "value1", "key2": "value2"}
         
         artifact_data = {
             "project_id": project["id"],
@@ -0,0 +1,267 @@
+"""
+Tests for Copilot CLI engine adapter.
+"""
+import asyncio
+import sys
+import pytest
+
+from app.engines import CopilotCLIEngine, EngineMessage, EngineStatus
+from app.engines import copilot_cli
+
+
+# Minimal REPL: answers each JSON prompt with a JSON line and counts prompts
+FAKE_REPL = [
+    sys.executable,
+    "-c",
+    (
+        "import json, sys\n"
+        "n = 0\n"
+        "for line in sys.stdin:\n"
+        "    n += 1\n"
+        "    prompt = json.loads(line)['prompt']\n"
+        "    print(json.dumps({'output': f'{n}:{prompt}'}), flush=True)\n"
+    ),
+]
+
+
+class TestPersistentProcess:
+    """Test the long-lived child process mode."""
+
+    @pytest.mark.asyncio
+    async def test_prompts_share_one_process(self, tmp_path):
+        """Test that successive prompts go to the same child process."""
+        engine = CopilotCLIEngine(working_directory=str(tmp_path), persistent_command=FAKE_REPL)
+        await engine.start_session()
+        pid = engine._repl.pid
+
+        first = await engine.execute("hello")
+        second = await engine.execute("again")
+
+        assert first.success and first.content == "1:hello"
+        assert second.content == "2:again"
+        assert engine._repl.pid == pid
+
+        await engine.stop_session()
+        assert engine._repl is None
+        assert engine.status == EngineStatus.STOPPED
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_process_exits(self, tmp_path, monkeypatch):
+        """Test falling back to a one-shot subprocess when the REPL dies."""
+        engine = CopilotCLIEngine(
+            working_directory=str(tmp_path),
+            persistent_command=[sys.executable, "-c", "pass"]
+        )
+        await engine.start_session()
+        await engine._repl.wait()
+
+        async def fake_one_shot(*args, **kwargs):
+            raise FileNotFoundError
+
+        monkeypatch.setattr("asyncio.create_subprocess_exec", fake_one_shot)
+        result = await engine.execute("hello")
+
+        assert not result.success
+        assert "not found" in result.error
+
+    @pytest.mark.asyncio
+    async def test_missing_persistent_command(self, tmp_path):
+        """Test that an unstartable REPL leaves one-shot mode in place."""
+        engine = CopilotCLIEngine(
+            working_directory=str(tmp_path),
+            persistent_command=["definitely-not-a-copilot-binary"]
+        )
+        response = await engine.start_session()
+
+        assert response.success
+        assert engine._repl is None
+
+
+    @pytest.mark.asyncio
+    async def test_overlong_reply_stops_process(self, tmp_path, monkeypatch):
+        """Test that a reply longer than the line limit is an error, not a desync."""
+        monkeypatch.setattr(copilot_cli, "REPL_LINE_LIMIT", 1024)
+        engine = CopilotCLIEngine(working_directory=str(tmp_path), persistent_command=FAKE_REPL)
+        await engine.start_session()
+
+        result = await engine.execute("x" * 4096)
+
+        assert not result.success
+        assert "exceeded" in result.error
+        assert engine._repl is None
+
+    @pytest.mark.asyncio
+    async def test_non_object_reply(self, tmp_path):
+        """Test that a JSON reply that is not an object is reported as invalid."""
+        engine = CopilotCLIEngine(
+            working_directory=str(tmp_path),
+            persistent_command=[
+                sys.executable, "-c",
+                "import sys\nfor line in sys.stdin:\n    print('[1, 2]', flush=True)\n"
+            ]
+        )
+        await engine.start_session()
+
+        result = await engine.execute("hello")
+
+        assert not result.success
+        assert "Invalid response" in result.error
+        await engine.stop_session()
+
+
+class TestExecuteStream:
+    """Test streamed command output."""
+
+    @pytest.mark.asyncio
+    async def test_multibyte_split_across_chunks(self, tmp_path, monkeypatch):
+        """Test that characters split across read chunks decode intact."""
+        real_exec = asyncio.create_subprocess_exec
+
+        async def fake_copilot(*args, **kwargs):
+            script = "import sys; sys.stdout.buffer.write('h\u00e9llo\\nw\u00f6rld\\n'.encode())"
+            return await real_exec(sys.executable, "-c", script, **kwargs)
+
+        monkeypatch.setattr("asyncio.create_subprocess_exec", fake_copilot)
+        monkeypatch.setattr(copilot_cli, "STREAM_CHUNK_SIZE", 2)
+        engine = CopilotCLIEngine(working_directory=str(tmp_path))
+
+        chunks = [chunk async for chunk in engine.execute_stream("hi")]
+        transcript = await engine.get_transcript()
+
+        assert "".join(chunks) == "h\u00e9llo\nw\u00f6rld\n"
+        assert transcript[-1].content == "h\u00e9llo\nw\u00f6rld\n"
+        assert transcript[-1].metadata["exit_code"] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_coalesce_chunks_batches_by_size_and_delay(self):
+        """Test that close chunks merge and a pause or size limit splits batches."""
+        from app.engines.engine_base import coalesce_chunks
+
+        async def source():
+            for chunk in ("a", "b", "c"):
+                yield chunk
+            await asyncio.sleep(0.05)
+            yield "d"
+            yield "efgh"
+
+        batches = [b async for b in coalesce_chunks(source(), max_delay=0.02, max_chars=3)]
+
+        assert batches == ["abc", "defgh"]
+
+    @pytest.mark.asyncio
+    async def test_coalesce_chunks_reraises_source_errors(self):
+        """Test that a failing source stream surfaces to the consumer."""
+        from app.engines.engine_base import coalesce_chunks
+
+        async def source():
+            yield "a"
+            raise OSError("pipe closed")
+
+        with pytest.raises(OSError):
+            [b async for b in coalesce_chunks(source())]
+
+class TestTranscript:
+    """Test transcript retrieval."""
+
+    @pytest.mark.asyncio
+    async def test_get_transcript_since(self, tmp_path):
+        """Test delta reads of the transcript by version."""
+        engine = CopilotCLIEngine(working_directory=str(tmp_path), persistent_command=FAKE_REPL)
+        await engine.start_session()
+
+        messages, version = await engine.get_transcript_since(0)
+        assert [m.role for m in messages] == ["system"]
+
+        await engine.execute("hello")
+        messages, version = await engine.get_transcript_since(version)
+        assert [m.content for m in messages] == ["hello", "1:hello"]
+
+        messages, same = await engine.get_transcript_since(version)
+        assert messages == [] and same == version
+
+        await engine.stop_session()
+        await engine.start_session()
+        messages, _ = await engine.get_transcript_since(version)
+        assert [m.role for m in messages] == ["system"]
+
+        # The new session's transcript grows past the old version; nothing is skipped
+        await engine.stop_session()
+        await engine.start_session()
+        await engine.execute("again")
+        messages, _ = await engine.get_transcript_since(version)
+        assert [m.role for m in messages] == ["system", "user", "assistant"]
+        await engine.stop_session()
+
+
+class TestEngineMessage:
+    """Test EngineMessage timestamps."""
+
+    def test_iso_timestamp(self):
+        """Test lazy ISO formatting of integer and string timestamps."""
+        ns = EngineMessage(role="user", content="x", timestamp=1_700_000_000_500_000_000)
+        iso = EngineMessage(role="user", content="x", timestamp="2024-01-01T00:00:00")
+
+        assert ns.iso_timestamp == "2023-11-14T22:13:20.500000+00:00"
+        assert iso.iso_timestamp == "2024-01-01T00:00:00"
+        assert EngineMessage(role="user", content="x").iso_timestamp is None
+
+
+class TestHealthCheck:
+    """Test the cached CLI health probe."""
+
+    @pytest.mark.asyncio
+    async def test_result_is_cached(self, monkeypatch):
+        """Test that repeated health checks reuse one probe until invalidated."""
+        calls = []
+
+        async def fake_exec(*args, **kwargs):
+            calls.append(args)
+            raise FileNotFoundError
+
+        monkeypatch.setattr("asyncio.create_subprocess_exec", fake_exec)
+        copilot_cli._invalidate_health_cache()
+        engine = CopilotCLIEngine()
+
+        assert await engine.health_check() is False
+        assert await engine.health_check() is False
+        assert len(calls) == 1
+
+        await engine._run_copilot_command("hi")
+        assert await engine.health_check() is False
+        assert len(calls) == 3
+
+        copilot_cli._invalidate_health_cache()
+
+
+class TestEngineRegistry:
+    """Test the engine factory registry."""
+
+    def test_registry_is_frozen_after_import(self):
+        """Test that engines are registered by decorator and the registry is read-only."""
+        from app.engines import EngineFactory
+
+        assert EngineFactory.list_engines() == ["copilot_cli"]
+        assert isinstance(EngineFactory.create("copilot_cli"), CopilotCLIEngine)
+        with pytest.raises(RuntimeError):
+            EngineFactory.register("other", CopilotCLIEngine)
+
+    def test_stateful_engines_are_not_shared(self):
+        """Test that each create() returns a fresh adapter for session-holding engines."""
+        from app.engines import EngineFactory
+
+        first = EngineFactory.create("copilot_cli", working_directory="/tmp")
+        second = EngineFactory.create("copilot_cli", working_directory="/tmp")
+
+        assert first is not second
+
+
+def test_engine_messages_are_slotted_and_immutable():
+    """Test that transcript messages carry no per-instance __dict__."""
+    import dataclasses
+
+    message = EngineMessage(role="user", content="hi", timestamp=0)
+
+    assert not hasattr(message, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.content = "changed"
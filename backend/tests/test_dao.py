@@ -18,7 +18,7 @@ def db_session() -> Session:
     """Create a test database session"""
     engine = create_engine("sqlite:///:memory:", echo=False)
     Base.metadata.create_all(bind=engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
     session = SessionLocal()
     
     yield session
@@ -93,6 +93,13 @@ class TestProjectDAO:
         assert result is True
         assert dao.get_project(db_session, project.id) is None
 
+    def test_project_exists(self, db_session):
+        """Test checking project existence"""
+        project = dao.create_project(db_session, name="Test Project")
+
+        assert dao.project_exists(db_session, project.id) is True
+        assert dao.project_exists(db_session, 9999) is False
+
 
 class TestTaskDAO:
     """Test task DAO operations"""
@@ -150,6 +157,31 @@ class TestTaskDAO:
         assert len(approved_tasks) == 1
         assert approved_tasks[0].title == "Task 2"
     
+    def test_task_status_stored_by_name(self, db_session):
+        """Test that enum columns store member names and accept plain values"""
+        from sqlalchemy import text
+        
+        project = dao.create_project(db_session, name="Test Project")
+        dao.create_task(db_session, project_id=project.id, title="Task 1", status=TaskStatus.APPROVED)
+        
+        stored = db_session.execute(text("SELECT status FROM tasks")).scalar()
+        assert stored == "APPROVED"
+        assert dao.list_tasks(db_session, status="approved")[0].status is TaskStatus.APPROVED
+    
+    def test_list_tasks_eager(self, db_session):
+        """Test preloading task relationships"""
+        project = dao.create_project(db_session, name="Test Project")
+        task = dao.create_task(db_session, project_id=project.id, title="Task 1")
+        dao.create_task_version(db_session, task_id=task.id, version_num=1, title="Task 1")
+        db_session.expire_all()
+
+        tasks = dao.list_tasks(db_session, project_id=project.id, eager=["project", "task_versions"])
+
+        assert "project" in tasks[0].__dict__
+        assert "task_versions" in tasks[0].__dict__
+        assert tasks[0].project.name == "Test Project"
+        assert len(tasks[0].task_versions) == 1
+
     def test_update_task(self, db_session):
         """Test updating a task"""
         project = dao.create_project(db_session, name="Test Project")
@@ -164,6 +196,58 @@ class TestTaskDAO:
         assert updated is not None
         assert updated.title == "Updated"
         assert updated.status == TaskStatus.IN_PROGRESS
+
+    def test_update_task_ignores_unknown_fields(self, db_session):
+        """Test that unknown fields are ignored and missing tasks return None"""
+        project = dao.create_project(db_session, name="Test Project")
+        task = dao.create_task(db_session, project_id=project.id, title="Original")
+        updated = dao.update_task(db_session, task.id, title="Updated", bogus="x")
+
+        assert updated is not None
+        assert updated.title == "Updated"
+        assert dao.update_task(db_session, 9999, title="Nope") is None
+
+    def test_bulk_create_tasks(self, db_session):
+        """Test creating many tasks in one call"""
+        project = dao.create_project(db_session, name="Test Project")
+        rows = [
+            {"project_id": project.id, "title": f"Task {i}", "priority": i}
+            for i in range(5)
+        ]
+        
+        count = dao.bulk_create_tasks(db_session, rows)
+        
+        assert count == 5
+        tasks = dao.list_tasks(db_session, project_id=project.id)
+        assert len(tasks) == 5
+        assert tasks[0].title == "Task 4"  # Highest priority first
+        assert all(t.status == TaskStatus.PENDING for t in tasks)
+        assert all(t.version == 1 and t.attempts == 0 for t in tasks)
+    
+    def test_list_tasks_raw(self, db_session):
+        """Test listing tasks as plain dicts"""
+        project = dao.create_project(db_session, name="Test Project")
+        dao.create_task(db_session, project_id=project.id, title="Low", priority=1)
+        dao.create_task(db_session, project_id=project.id, title="High", priority=5, status=TaskStatus.APPROVED)
+        
+        rows = dao.list_tasks_raw(db_session, project_id=project.id)
+        approved = dao.list_tasks_raw(db_session, status=TaskStatus.APPROVED)
+        
+        assert [r["title"] for r in rows] == ["High", "Low"]
+        assert rows[0]["status"] == TaskStatus.APPROVED
+        assert set(rows[0]) == {c.key for c in dao.TASK_LIST_COLUMNS}
+        assert [r["title"] for r in approved] == ["High"]
+    
+    def test_iter_tasks(self, db_session):
+        """Test streaming tasks in small batches"""
+        project = dao.create_project(db_session, name="Test Project")
+        dao.bulk_create_tasks(db_session, [
+            {"project_id": project.id, "title": f"Task {i}"} for i in range(7)
+        ])
+        
+        titles = [t.title for t in dao.iter_tasks(db_session, project_id=project.id, batch_size=3)]
+        
+        assert titles == [f"Task {i}" for i in range(7)]
     
     def test_get_next_approved_task(self, db_session):
         """Test getting next approved task"""
@@ -220,6 +304,25 @@ class TestChangeRequestDAO:
         assert approved.status == ChangeRequestStatus.APPROVED
 
 
+class TestApprovalDAO:
+    """Test approval DAO operations"""
+    
+    def test_list_approvals_keyset_pages(self, db_session):
+        """Test paging approvals newest first with before_id"""
+        project = dao.create_project(db_session, name="Test Project")
+        task = dao.create_task(db_session, project_id=project.id, title="Task 1")
+        for i in range(5):
+            dao.create_approval(db_session, task_id=task.id, approver=f"user{i}", approved=True)
+        
+        first = dao.list_approvals(db_session, task_id=task.id, limit=2)
+        second = dao.list_approvals(db_session, task_id=task.id, before_id=first[-1].id, limit=2)
+        rest = dao.list_approvals(db_session, task_id=task.id, before_id=second[-1].id)
+        
+        assert [a.approver for a in first] == ["user4", "user3"]
+        assert [a.approver for a in second] == ["user2", "user1"]
+        assert [a.approver for a in rest] == ["user0"]
+
+
 class TestArtifactDAO:
     """Test artifact DAO operations"""
     
@@ -240,6 +343,43 @@ class TestArtifactDAO:
         assert artifact.artifact_type == ArtifactType.PLAN
         assert artifact.sha256 == "abc123"
     
+    def test_artifact_sha256_stored_as_bytes(self, db_session):
+        """Test that hex digests are stored as raw bytes and read back as hex"""
+        from sqlalchemy import text
+        
+        project = dao.create_project(db_session, name="Test Project")
+        digest = "ab" * 32
+        artifact = dao.create_artifact(
+            db_session,
+            project_id=project.id,
+            artifact_type=ArtifactType.PLAN,
+            name="plan.json",
+            file_path="/tmp/plan.json",
+            sha256=digest
+        )
+        db_session.expire_all()
+        
+        assert db_session.execute(text("SELECT length(sha256) FROM artifacts")).scalar() == 32
+        assert dao.get_artifact(db_session, artifact.id).sha256 == digest
+    
+    def test_create_artifact_with_blake3(self, db_session):
+        """Test that a blake3 digest is stored alongside an empty sha256"""
+        project = dao.create_project(db_session, name="Test Project")
+        digest = "cd" * 32
+        artifact = dao.create_artifact(
+            db_session,
+            project_id=project.id,
+            artifact_type=ArtifactType.DIFF,
+            name="change.diff",
+            file_path="/tmp/change.diff",
+            blake3=digest
+        )
+        db_session.expire_all()
+        
+        stored = dao.get_artifact(db_session, artifact.id)
+        assert stored.blake3 == digest
+        assert stored.sha256 is None
+    
     def test_list_artifacts_by_type(self, db_session):
         """Test listing artifacts by type"""
         project = dao.create_project(db_session, name="Test Project")
@@ -271,18 +411,34 @@ class TestRunDAO:
         assert run.engine == "copilot_cli"
         assert run.status == RunStatus.RUNNING
     
+    def test_bulk_create_runs(self, db_session):
+        """Test creating many runs in one call"""
+        project = dao.create_project(db_session, name="Test Project")
+        task = dao.create_task(db_session, project_id=project.id, title="Test Task")
+        
+        count = dao.bulk_create_runs(db_session, [
+            {"task_id": task.id, "engine": "copilot_cli"},
+            {"task_id": task.id, "engine": "copilot_cli"},
+        ])
+        
+        assert count == 2
+        runs = dao.list_runs(db_session, task_id=task.id)
+        assert len(runs) == 2
+        assert all(r.status == RunStatus.RUNNING for r in runs)
+        assert all(r.start_time is not None for r in runs)
+    
     def test_complete_run(self, db_session):
         """Test completing a run"""
         project = dao.create_project(db_session, name="Test Project")
         task = dao.create_task(db_session, project_id=project.id, title="Test Task")
         run = dao.create_run(db_session, task_id=task.id, engine="copilot_cli")
         
-        completed = dao.complete_run(db_session, run.id, RunStatus.SUCCESS, gate_results='{"passed": true}')
+        completed = dao.complete_run(db_session, run.id, RunStatus.SUCCESS, gate_results={"passed": True})
         
         assert completed is not None
         assert completed.status == RunStatus.SUCCESS
         assert completed.end_time is not None
-        assert completed.gate_results == '{"passed": true}'
+        assert completed.gate_results == {"passed": True}
 
 
 class TestControlStateDAO:
@@ -308,3 +464,70 @@ class TestControlStateDAO:
         
         resumed = dao.resume_execution(db_session, project.id)
         assert resumed.paused is False
+    
+    def test_update_control_state_upserts(self, db_session):
+        """Test that updating a missing control state creates it"""
+        project = dao.create_project(db_session, name="Test Project")
+        
+        created = dao.update_control_state(db_session, project.id, max_attempts=5)
+        assert created.max_attempts == 5
+        assert created.timeout_seconds == 300
+        
+        updated = dao.update_control_state(db_session, project.id, paused=True)
+        assert updated.id == created.id
+        assert updated.paused is True
+        assert updated.max_attempts == 5
+
+
+class TestRequestCache:
+    """Test request-scoped DAO lookup cache"""
+    
+    def test_cached_get_task(self, db_session):
+        """Test that repeated lookups in a request return the cached row"""
+        project = dao.create_project(db_session, name="Test Project")
+        task = dao.create_task(db_session, project_id=project.id, title="Original")
+        
+        with dao.request_cache():
+            first = dao.get_task(db_session, task.id)
+            assert dao.get_task(db_session, task.id) is first
+            
+            dao.update_task(db_session, task.id, title="Updated")
+            assert dao.get_task(db_session, task.id).title == "Updated"
+            
+            assert dao.delete_task(db_session, task.id)
+            assert dao.get_task(db_session, task.id) is None
+    
+    def test_no_cache_outside_request(self, db_session):
+        """Test that lookups outside a request scope are not cached"""
+        project = dao.create_project(db_session, name="Test Project")
+        
+        assert dao._dao_cache.get() is None
+        assert dao.get_project(db_session, project.id).id == project.id
+
+
+class TestTransaction:
+    """Test grouping DAO writes into one commit"""
+    
+    def test_transaction_commits_once(self, db_session):
+        """Test that writes inside a transaction block commit together"""
+        project = dao.create_project(db_session, name="Test Project")
+        
+        with dao.transaction(db_session):
+            task = dao.create_task(db_session, project_id=project.id, title="Task 1")
+            dao.create_task_version(db_session, task_id=task.id, version_num=2, title="Task 1")
+            updated = dao.update_task(db_session, task.id, version=2)
+            assert updated.version == 2
+            assert db_session.in_transaction()
+        
+        assert dao.get_latest_task_version(db_session, task.id).version_num == 2
+    
+    def test_transaction_rolls_back_on_error(self, db_session):
+        """Test that a failing transaction block discards all writes"""
+        project = dao.create_project(db_session, name="Test Project")
+        
+        with pytest.raises(RuntimeError):
+            with dao.transaction(db_session):
+                dao.create_task(db_session, project_id=project.id, title="Task 1")
+                raise RuntimeError("boom")
+        
+        assert dao.list_tasks(db_session, project_id=project.id) == []
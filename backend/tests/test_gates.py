@@ -0,0 +1,111 @@
+"""
+Tests for gates system.
+"""
+import pytest
+from dataclasses import FrozenInstanceError
+
+from app.core.gates import GateSpec, GateResult, GateRunner
+from app.core.sandbox import CommandRunner
+
+
+class TestGateResult:
+    """Test GateResult container."""
+
+    def test_result_is_immutable(self):
+        """Test that gate results cannot be mutated after creation."""
+        result = GateResult(
+            gate_name="lint",
+            passed=True,
+            exit_code=0,
+            stdout="ok",
+            stderr="",
+            execution_time=0.1
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            result.passed = False
+
+    def test_to_dict(self):
+        """Test conversion of a result to a dictionary."""
+        result = GateResult(
+            gate_name="lint",
+            passed=False,
+            exit_code=1,
+            stdout="",
+            stderr="boom",
+            execution_time=0.5,
+            error="Execution error: boom"
+        )
+
+        data = result.to_dict()
+
+        assert data["gate_name"] == "lint"
+        assert data["passed"] is False
+        assert data["error"] == "Execution error: boom"
+        assert "executed_at" in data
+
+
+class TestGateRunner:
+    """Test GateRunner execution and validation."""
+
+    @pytest.mark.asyncio
+    async def test_run_gate_exit_code(self):
+        """Test gate passing on zero exit code."""
+        runner = GateRunner(command_runner=CommandRunner(allowed_commands={"echo"}))
+        gate = GateSpec(name="echo", command="echo hello")
+
+        result = await runner.run_gate(gate)
+
+        assert result.passed
+        assert result.exit_code == 0
+        assert "hello" in result.stdout
+
+    @pytest.mark.asyncio
+    async def test_run_gate_security_violation(self):
+        """Test gate failing when command is blocked."""
+        runner = GateRunner(command_runner=CommandRunner())
+        gate = GateSpec(name="danger", command="rm -rf /")
+
+        result = await runner.run_gate(gate)
+
+        assert not result.passed
+        assert result.error.startswith("Security violation")
+
+    def test_get_summary(self):
+        """Test summary statistics for gate results."""
+        runner = GateRunner(command_runner=CommandRunner())
+        results = [
+            GateResult(gate_name="a", passed=True, exit_code=0, stdout="", stderr="", execution_time=1.0),
+            GateResult(gate_name="b", passed=False, exit_code=1, stdout="", stderr="", execution_time=0.5),
+        ]
+
+        summary = runner.get_summary(results)
+
+        assert summary["total"] == 2
+        assert summary["passed"] == 1
+        assert summary["failed"] == 1
+        assert summary["pass_rate"] == 0.5
+        assert summary["total_execution_time"] == 1.5
+        assert summary["all_passed"] is False
+        assert runner.all_passed(results) == summary["all_passed"]
+
+    def test_get_summary_empty(self):
+        """Test summary of an empty result list."""
+        runner = GateRunner(command_runner=CommandRunner())
+
+        summary = runner.get_summary([])
+
+        assert summary["total"] == 0
+        assert summary["pass_rate"] == 0
+        assert summary["all_passed"] is True
+
+    def test_validate_output_matches(self):
+        """Test output_matches with literal and regex patterns."""
+        runner = GateRunner(command_runner=CommandRunner())
+        literal = GateSpec(name="lit", command="x", pass_criteria="output_matches", expected_output="All checks passed")
+        regex = GateSpec(name="re", command="x", pass_criteria="output_matches", expected_output=r"\d+ passed")
+
+        assert runner._validate_result(literal, 1, "All checks passed!", "")
+        assert not runner._validate_result(literal, 0, "1 error", "")
+        assert runner._validate_result(regex, 0, "", "12 passed in 0.3s")
+        assert not runner._validate_result(regex, 0, "no tests ran", "")
@@ -53,7 +53,7 @@ def test_new_project_uses_migrations(tmp_path):
     cursor.execute("SELECT version_num FROM alembic_version")
     version = cursor.fetchone()
     assert version is not None, "Migration version should be set"
-    assert version[0] == "e6e5369fb4d1", "Should be at head revision"
+    assert version[0] == "d27f4a8e61c3", "Should be at head revision"
     
     # Verify all expected tables exist
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
@@ -145,3 +145,294 @@ def test_migration_creates_unique_constraint(tmp_path):
     # Clean up
     db_manager.engines.pop(project_id, None)
     db_manager.session_makers.pop(project_id, None)
+
+
+def test_sqlite_project_engine_uses_wal(tmp_path):
+    """Test that project SQLite engines apply the tuned PRAGMAs"""
+    from sqlalchemy import text
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    project_id = 997
+    db_manager.init_project_db(project_id)
+    
+    with db_manager.engines[project_id].connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    
+    db_manager.close_project_db(project_id)
+
+
+def test_migration_creates_task_scan_index(tmp_path):
+    """Test that the task listing index exists and covers the ORDER BY"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    
+    project_id = 996
+    db_manager.init_project_db(project_id)
+    
+    db_path = tmp_path / f"project_{project_id}.db"
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("PRAGMA index_list(tasks)")
+    index_names = [idx[1] for idx in cursor.fetchall()]
+    assert "ix_tasks_project_status_priority" in index_names
+    
+    cursor.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE project_id = 1 AND status = 'APPROVED' "
+        "ORDER BY priority DESC, created_at LIMIT 1"
+    )
+    plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "ix_tasks_project_status_priority" in plan
+    assert "TEMP B-TREE" not in plan
+    
+    conn.close()
+    db_manager.close_project_db(project_id)
+
+
+def test_migration_creates_foreign_key_scan_indexes(tmp_path):
+    """Test that the filtered list queries have supporting indexes"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    
+    project_id = 995
+    db_manager.init_project_db(project_id)
+    
+    conn = sqlite3.connect(tmp_path / f"project_{project_id}.db")
+    cursor = conn.cursor()
+    
+    expected = {
+        "tasks": "ix_tasks_project_phase_priority",
+        "change_requests": "ix_change_requests_task_status_created",
+        "artifacts": "ix_artifacts_project_type",
+        "task_versions": "ix_task_versions_task_version",
+        "runs": "ix_runs_task_status",
+    }
+    for table, index_name in expected.items():
+        cursor.execute(f"PRAGMA index_list({table})")
+        assert index_name in [idx[1] for idx in cursor.fetchall()]
+    
+    cursor.execute("EXPLAIN QUERY PLAN SELECT * FROM runs WHERE task_id = 1 AND status = 'RUNNING'")
+    plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "ix_runs_task_status" in plan
+    
+    cursor.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM change_requests WHERE task_id = 1 AND status = 'DRAFT' "
+        "ORDER BY created_at DESC"
+    )
+    plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "ix_change_requests_task_status_created" in plan
+    
+    conn.close()
+    db_manager.close_project_db(project_id)
+
+def test_least_recently_used_engine_is_evicted(tmp_path):
+    """Test that project engines beyond max_open_engines are disposed"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    db_manager.max_open_engines = 2
+    
+    for project_id in (1, 2):
+        db_manager.init_project_db(project_id)
+    
+    # Touch project 1 so project 2 becomes least recently used
+    session_gen = db_manager.get_session(1)
+    next(session_gen)
+    session_gen.close()
+    
+    db_manager.init_project_db(3)
+    
+    assert list(db_manager.engines) == [1, 3]
+    assert 2 not in db_manager.session_makers
+    
+    for project_id in (1, 3):
+        db_manager.close_project_db(project_id)
+
+
+def test_sqlite_pooling_can_be_disabled(tmp_path):
+    """Test that sqlite_pooling=False falls back to NullPool"""
+    from sqlalchemy.pool import NullPool, QueuePool
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    pooled = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    unpooled = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path), sqlite_pooling=False))
+    
+    assert pooled._get_engine_kwargs()["poolclass"] is QueuePool
+    assert unpooled._get_engine_kwargs()["poolclass"] is NullPool
+
+
+def test_search_path_option_validates_schema():
+    """Test that only project schema names are interpolated into search_path"""
+    from app.db.database import _search_path_option
+    
+    assert _search_path_option("project_12") == "-csearch_path=project_12"
+    with pytest.raises(ValueError):
+        _search_path_option("public; DROP TABLE tasks")
+
+
+def test_bulk_init_skips_databases_at_head(tmp_path, monkeypatch):
+    """Test bulk initialization and that up-to-date databases skip migrations"""
+    from app.db import database
+    from app.core.config import DatabaseConfig
+    
+    config = DatabaseConfig(type="sqlite", path=str(tmp_path))
+    db_manager = database.DatabaseManager(db_config=config)
+    db_manager.bulk_init_project_dbs([11, 12, 13])
+    
+    assert set(db_manager.engines) == {11, 12, 13}
+    assert all(database.is_at_head(engine) for engine in db_manager.engines.values())
+    for project_id in (11, 12, 13):
+        db_manager.close_project_db(project_id)
+    
+    calls = []
+    monkeypatch.setattr(database, "run_migrations", lambda *args: calls.append(args))
+    reopened = database.DatabaseManager(db_config=config)
+    reopened.init_project_db(11)
+    
+    assert calls == []
+    reopened.close_project_db(11)
+
+
+
+def test_find_unmigrated_reads_versions_without_engines(tmp_path, monkeypatch):
+    """Test that bulk initialization only migrates projects below head"""
+    from app.db import database
+    from app.core.config import DatabaseConfig
+    
+    config = DatabaseConfig(type="sqlite", path=str(tmp_path))
+    db_manager = database.DatabaseManager(db_config=config)
+    db_manager.init_project_db(31)
+    db_manager.close_project_db(31)
+    sqlite3.connect(tmp_path / "project_32.db").close()  # Empty file, no alembic_version
+    
+    assert db_manager._find_unmigrated([31, 32, 33]) == [32, 33]
+    
+    calls = []
+    monkeypatch.setattr(database, "run_migrations", lambda *args: calls.append(args))
+    db_manager.bulk_init_project_dbs([31])
+    
+    assert calls == []
+    assert list(db_manager.engines) == [31]
+    db_manager.close_project_db(31)
+
+
+def test_find_unmigrated_with_relative_path(tmp_path, monkeypatch):
+    """Test that version lookup works for a relative database directory (the default ./data)"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    monkeypatch.chdir(tmp_path)
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path="./data"))
+    db_manager.init_project_db(41)
+    db_manager.close_project_db(41)
+    
+    assert db_manager._find_unmigrated([41, 42]) == [42]
+
+@pytest.mark.asyncio
+async def test_ensure_project_db_initializes_once(tmp_path):
+    """Test that concurrent ensure_project_db calls share one initialization"""
+    import asyncio
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    
+    await asyncio.gather(*(db_manager.ensure_project_db(21) for _ in range(5)))
+    
+    assert list(db_manager.engines) == [21]
+    db_manager.close_project_db(21)
+
+
+def test_configure_resets_cached_connection_settings(tmp_path):
+    """Test that cached URLs and engine kwargs follow configure()"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    assert db_manager._build_database_url(1).startswith("sqlite:///")
+    assert "pool_recycle" not in db_manager._engine_kwargs
+    
+    db_manager.configure(DatabaseConfig(
+        type="postgresql", host="db", database="cdd", username="u", password="p"
+    ))
+    
+    assert db_manager._build_database_url(1) == "postgresql://u:p@db:5432/cdd"
+    assert db_manager._build_database_url(2) is db_manager._build_database_url(1)
+    assert db_manager._engine_kwargs["pool_recycle"] == 1800
+
+
+def test_reset_test_database_restores_empty_schema():
+    """Test that a full test reset restores the snapshot of the empty schema"""
+    from app.db.database import DatabaseManager
+    from app.db import dao
+    
+    manager = DatabaseManager(test_mode=True)
+    manager._init_test_database()
+    
+    session = manager._test_session_maker()
+    dao.create_project(session, name="Snapshot Project")
+    session.close()
+    
+    manager.reset_test_database()
+    
+    session = manager._test_session_maker()
+    try:
+        assert dao.list_projects(session) == []
+        dao.create_project(session, name="After Reset")
+        assert len(dao.list_projects(session)) == 1
+    finally:
+        session.close()
+        manager.disable_test_mode()
+
+
+def test_base_path_is_created_once(tmp_path, monkeypatch):
+    """Test that managers sharing a SQLite directory only create it once"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    config = DatabaseConfig(type="sqlite", path=str(tmp_path / "projects"))
+    DatabaseManager(db_config=config)
+    assert (tmp_path / "projects").is_dir()
+    
+    def fail_mkdir(*args, **kwargs):
+        raise AssertionError("mkdir should not be called again")
+    
+    monkeypatch.setattr(Path, "mkdir", fail_mkdir)
+    DatabaseManager(db_config=config).configure(config)
+
+
+@pytest.mark.asyncio
+async def test_async_session_requires_postgresql(tmp_path):
+    """Test that SQLite projects keep the sync session path"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    
+    with pytest.raises(ValueError):
+        async for _ in db_manager.get_async_session(1):
+            pass
+    assert db_manager.async_engines == {}
+
+
+def test_engine_for_reuses_project_engine(tmp_path):
+    """Test that engine_for initializes a project once and returns its pooled engine"""
+    from app.db.database import DatabaseManager
+    from app.core.config import DatabaseConfig
+    
+    db_manager = DatabaseManager(db_config=DatabaseConfig(type="sqlite", path=str(tmp_path)))
+    
+    engine = db_manager.engine_for(41)
+    
+    assert engine is db_manager.engines[41]
+    assert db_manager.engine_for(41) is engine
+    db_manager.close_project_db(41)
@@ -154,6 +154,16 @@ class TestCommandRunner:
         assert "Hello, World!" in stdout
         assert stderr == ""
     
+    @pytest.mark.asyncio
+    async def test_run_command_non_utf8_output(self):
+        """Test that invalid UTF-8 output is replaced instead of raising."""
+        runner = CommandRunner(allowed_commands={"printf"})
+        
+        returncode, stdout, stderr = await runner.run("printf '\\377ok'")
+        
+        assert returncode == 0
+        assert stdout == "\ufffdok"
+    
     @pytest.mark.asyncio
     async def test_run_command_timeout(self):
         """Test command timeout enforcement."""
@@ -181,6 +191,85 @@ class TestCommandRunner:
         assert returncode == 0
         assert str(tmp_path) in stdout
     
+    def test_split_simple_command(self):
+        """Test that only commands without shell syntax bypass the shell."""
+        assert CommandRunner._split_simple_command("ruff check .") == ["ruff", "check", "."]
+        assert CommandRunner._split_simple_command("echo 'a b'") == ["echo", "a b"]
+        
+        assert CommandRunner._split_simple_command("pytest | tee out.txt") is None
+        assert CommandRunner._split_simple_command("echo $HOME") is None
+        assert CommandRunner._split_simple_command("ls *.py") is None
+        assert CommandRunner._split_simple_command("FOO=1 make") is None
+        assert CommandRunner._split_simple_command("exit 0") is None
+        assert CommandRunner._split_simple_command("cd .") is None
+        assert CommandRunner._split_simple_command("command -v ls") is None
+        assert CommandRunner._split_simple_command("! grep -q x file") is None
+        assert CommandRunner._split_simple_command("time make") is None
+    
+    @pytest.mark.asyncio
+    async def test_run_shell_command(self):
+        """Test commands using shell features still run through the shell."""
+        runner = CommandRunner(allowed_commands={"echo"})
+        
+        returncode, stdout, stderr = await runner.run("echo one && echo two")
+        
+        assert returncode == 0
+        assert stdout.split() == ["one", "two"]
+    
+    @pytest.mark.asyncio
+    async def test_run_missing_executable(self):
+        """Test a missing executable reports exit code 127 like the shell."""
+        runner = CommandRunner()
+        
+        returncode, stdout, stderr = await runner.run("definitely-not-a-real-binary --flag")
+        
+        assert returncode == 127
+        assert "not found" in stderr
+    
+    @pytest.mark.asyncio
+    async def test_run_shell_builtins(self):
+        """Test that shell built-ins still run through the shell."""
+        runner = CommandRunner()
+        
+        returncode, _, _ = await runner.run("exit 3")
+        assert returncode == 3
+        
+        returncode, _, stderr = await runner.run("cd /tmp")
+        assert returncode == 0
+        assert stderr == ""
+    
+    @pytest.mark.asyncio
+    async def test_run_negated_command(self, tmp_path):
+        """Test that reserved words such as ! run through the shell."""
+        runner = CommandRunner()
+        target = tmp_path / "file.txt"
+        target.write_text("abc\n")
+        
+        returncode, _, stderr = await runner.run(f"! grep -q x {target}")
+        assert returncode == 0
+        assert stderr == ""
+        
+        returncode, _, _ = await runner.run(f"! grep -q a {target}")
+        assert returncode == 1
+    
+    @pytest.mark.asyncio
+    async def test_run_non_executable_script(self, tmp_path):
+        """Test scripts exec() rejects fall back to the shell's handling."""
+        runner = CommandRunner()
+        
+        script = tmp_path / "not_executable.sh"
+        script.write_text("#!/bin/sh\necho hi\n")
+        script.chmod(0o644)
+        returncode, _, _ = await runner.run(str(script))
+        assert returncode == 126
+        
+        no_shebang = tmp_path / "no_shebang.sh"
+        no_shebang.write_text("echo hi\n")
+        no_shebang.chmod(0o755)
+        returncode, stdout, _ = await runner.run(str(no_shebang))
+        assert returncode == 0
+        assert stdout == "hi\n"
+    
     def test_empty_command(self):
         """Test validation of empty command."""
         runner = CommandRunner()